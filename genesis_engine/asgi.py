@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")
 
 application = get_asgi_application()
+
+# Imported once Django is set up; serves buffered pixel hits before Django sees them
+from outbound.middleware import TrackingPixelASGIMiddleware  # noqa: E402
+
+application = TrackingPixelASGIMiddleware(application)
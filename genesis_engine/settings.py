@@ -67,6 +67,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Answers /api/track/open/ before sessions/CSRF/auth run; keep it first
+    'outbound.middleware.TrackingPixelMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -101,6 +103,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "genesis_engine.wsgi.application"
+# The tracking/lead views are async; serve with e.g. gunicorn -k uvicorn.workers.UvicornWorker
+ASGI_APPLICATION = "genesis_engine.asgi.application"
 
 
 # Database
@@ -114,6 +118,51 @@ DATABASES = {
 }
 
 
+# Cache
+# Redis when REDIS_URL is set (shared across workers), per-process memory otherwise.
+# REDIS_URL also switches the tracking pixel to the Redis open buffer, which is only
+# written to the DB by outbound.engine.tasks.flush_pixel_opens on a Celery beat schedule.
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Outreach workers log to a file; delay=True skips opening it until the first record
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "handlers": {
+        "outreach_file": {
+            "class": "logging.FileHandler",
+            "filename": BASE_DIR / "outreach.log",
+            "delay": True,
+            "formatter": "plain",
+        },
+    },
+    "loggers": {
+        "outbound.engine.outreach": {
+            "handlers": ["outreach_file"],
+            "level": env("OUTREACH_LOG_LEVEL", default="INFO"),
+        },
+    },
+}
+
+
 
 EMAIL_ACCOUNTS = [
 
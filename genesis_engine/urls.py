@@ -18,7 +18,7 @@ from django.contrib import admin
 from django.urls import path,include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import HttpResponse
+from outbound import views
 
 
 urlpatterns = [
@@ -27,9 +27,9 @@ urlpatterns = [
 
     path("admin/", admin.site.urls),
     path('api/', include('outbound.url')),
-    path("", lambda request: HttpResponse("Genesis Engine running 🚀")),
+    path("", views.home, name="home"),
 
-              ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+              ]
 
 if settings.DEBUG:
 
@@ -3,15 +3,24 @@
 Production-Ready Clutch.co Business Scraper with Django ORM Integration
 Handles JavaScript-rendered content, duplicates, rate limiting, and edge cases
 Saves directly to Django Lead model instead of CSV
+
+Set CHROMEDRIVER_PATH to a bundled ChromeDriver binary (CI/production) to skip
+webdriver-manager's version check and download entirely
 """
 
 import os
+import re
 import sys
 import time
+import queue
+import random
 import logging
-from typing import Set, List, Optional, Tuple
-from urllib.parse import urlparse, parse_qs, unquote
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Set, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse, parse_qs, parse_qsl, urlencode, unquote
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 
 from selenium import webdriver
@@ -20,11 +29,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.common.exceptions import (
     TimeoutException,
-    NoSuchElementException,
     WebDriverException,
-    StaleElementReferenceException
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
@@ -36,9 +46,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")  # <-
 try:
     import django
     django.setup()
-    from django.db import IntegrityError, transaction
+    from django.db import IntegrityError, connection
+    from django.db.models import Q
     from django.core.exceptions import ValidationError
-    from outbound.models import Lead  # UPDATE THIS TO YOUR ACTUAL APP NAME
+    from outbound.models import SCRAPED_SOURCES, Lead  # UPDATE THIS TO YOUR ACTUAL APP NAME
+    from outbound.engine.utils import ScalableBloomFilter
     print("✅ Django setup complete")
 except Exception as e:
     print(f"⚠️  Django setup failed: {e}")
@@ -46,20 +58,212 @@ except Exception as e:
 
 
 # ---------------- Configuration ----------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScraperConfig:
-    """Production configuration for the scraper"""
+    """Production configuration for the scraper (immutable; shared read-only by pool workers)"""
     base_url: str = "https://clutch.co"
     max_pages: int = 10
     page_delay: float = 5.0  # Delay between pages
     element_timeout: int = 20
+    command_timeout: int = 60  # WebDriver HTTP client timeout for browser commands
     max_retries: int = 3
-    retry_delay: float = 10.0
+    retry_delay: float = 2.0  # Base delay, doubled on each retry
     headless: bool = False  # Set to True for production
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     save_batch_size: int = 10  # Save to DB in batches
     captcha_timeout: int = 120  # Max wait time for CAPTCHA resolution
     scroll_pause: float = 2.0  # Pause between scrolls
+    pool_size: int = 1  # Chrome instances scraping niche URLs in parallel
+    max_uses_per_instance: int = 50  # Pages per Chrome instance before it is recycled
+
+
+# ---------------- Selectors ----------------
+# Primary card selectors (based on current Clutch structure)
+_CARD_SELECTORS = (
+    ".provider",
+    "li.provider",
+    ".provider-item",
+    ".directory-providers .provider",
+    "[data-provider-id]",
+    ".company-listing",
+    "article.provider",
+)
+_CARD_SELECTOR_CSS = ", ".join(_CARD_SELECTORS)
+
+_NAME_SELECTORS = (
+    "h3.provider__name a",
+    ".provider__name a",
+    "h3 a[href*='/profile/']",
+    ".company-name a",
+    "h2 a",
+)
+
+_WEBSITE_SELECTORS = (
+    "a.provider__cta-link.website-link__item[href*='redirect']",
+    "a[href*='redirect'][title*='Visit']",
+    ".website-link__item[href*='redirect']",
+    "a.visit-website",
+)
+
+# Fallback: locate cards through their website links
+_FALLBACK_LINK_SELECTOR = "a[href*='redirect'][title*='Visit'], a.website-link__item"
+
+# Walks the listing in-page and returns every card in one WebDriver round-trip.
+# arguments: card selectors, name selectors, website selectors, fallback link selector
+_EXTRACT_CARDS_JS = """
+const [cardSelectors, nameSelectors, websiteSelectors, fallbackSelector] = arguments;
+const pick = (root, selectors, accept) => {
+    for (const s of selectors) {
+        const el = root.querySelector(s);
+        if (el && accept(el)) return el;
+    }
+    return null;
+};
+
+let cards = [];
+let used = null;
+for (const s of cardSelectors) {
+    const found = document.querySelectorAll(s);
+    if (found.length) { cards = Array.from(found); used = s; break; }
+}
+if (!cards.length) {
+    const parents = Array.from(document.querySelectorAll(fallbackSelector))
+        .map(link => link.parentElement && link.parentElement.closest("[class*='provider'], [class*='listing']"))
+        .filter(Boolean);
+    cards = Array.from(new Set(parents));
+    if (cards.length) used = "fallback-website-links";
+}
+
+return {
+    selector: used,
+    rows: cards.map(card => {
+        const name = pick(card, nameSelectors, el => el.innerText.trim());
+        const website = pick(card, websiteSelectors, el => el.href);
+        return {
+            name: name ? name.innerText.trim() : null,
+            profile: name ? (name.href || "") : "",
+            redirect: website ? website.href : null,
+        };
+    }),
+};
+"""
+
+# Social media and non-business domains
+# (mailto:/tel:/javascript: links are rejected by the scheme check)
+_EXCLUDED_DOMAINS = (
+    'facebook.com', 'fb.com', 'twitter.com', 'x.com', 'linkedin.com',
+    'instagram.com', 'youtube.com', 'youtu.be', 'tiktok.com',
+    'pinterest.com', 'behance.net', 'dribbble.com', 'github.com',
+    'clutch.co', 'goodfirms.co', 'upwork.com', 'fiverr.com',
+)
+# Single alternation scanned in C instead of one Python substring check per domain
+_EXCLUDED_RE = re.compile("|".join(re.escape(domain) for domain in _EXCLUDED_DOMAINS))
+
+
+_CAPTCHA_INDICATORS = (
+    'captcha', 'verify you are human', 'complete the action',
+    'cloudflare', 'please verify', 'security check',
+    'human verification', 'prove you are human'
+)
+
+# Checks the title and known challenge anchors without shipping page_source over the wire
+_CAPTCHA_PROBE_JS = """
+return !!(
+    document.querySelector('#challenge-form, .cf-turnstile, [id*=captcha], [class*=captcha]') ||
+    /captcha|verify you are human|cloudflare|security check|human verification/i.test(document.title)
+);
+"""
+
+# Scrolls in segments (25/50/75/100%) then back to top, pausing in-page between steps.
+# arguments: pause in seconds, async callback
+_SMART_SCROLL_JS = """
+const pause = arguments[0] * 1000;
+const done = arguments[arguments.length - 1];
+(async () => {
+    const height = document.body.scrollHeight;
+    for (const position of [0.25, 0.5, 0.75, 1.0]) {
+        window.scrollTo(0, Math.floor(height * position));
+        await new Promise(resolve => setTimeout(resolve, pause));
+    }
+    window.scrollTo(0, 0);
+    await new Promise(resolve => setTimeout(resolve, pause));
+    done();
+})();
+"""
+
+# Static assets blocked through CDP (Chrome has no working --disable-images flag)
+_BLOCKED_RESOURCE_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*.css",
+)
+
+
+# ---------------- Driver Binary ----------------
+_DRIVER_PATH: Optional[str] = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+
+def _driver_path() -> str:
+    """Resolve the ChromeDriver binary once per process instead of once per browser"""
+    global _DRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+
+class PooledChrome(webdriver.Remote):
+    """
+    Local Chrome with a sized WebDriver HTTP pool. webdriver.Chrome builds its own
+    RemoteConnection and takes no client_config, so its urllib3 pool (maxsize 1) and
+    timeout can't be set at construction; this starts the service and connection itself.
+    """
+
+    def __init__(self, service: Service, options: Options, pool_maxsize: int, timeout: int):
+        self.service = service
+        self.service.start()
+
+        client_config = ClientConfig(
+            remote_server_addr=self.service.service_url,
+            # RemoteConnection reads the PoolManager kwargs from this nested key
+            init_args_for_pool_manager={"init_args_for_pool_manager": {"maxsize": pool_maxsize}},
+            timeout=timeout,
+        )
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=self.service.service_url,
+            vendor_prefix="goog",
+            browser_name=DesiredCapabilities.CHROME["browserName"],
+            client_config=client_config,
+        )
+        try:
+            super().__init__(command_executor=executor, options=options)
+        except Exception:
+            self.quit()
+            raise
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> dict:
+        """Chrome DevTools command (the chromium-specific endpoint our connection registers)"""
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self) -> None:
+        """Close the browser and stop the ChromeDriver process"""
+        try:
+            super().quit()
+        except Exception:
+            pass
+        finally:
+            self.service.stop()
+
+
+# ---------------- URL Helpers ----------------
+def _page_url(base_url: str, page_num: int) -> str:
+    """Return base_url with its page query parameter set to page_num"""
+    parsed = urlparse(base_url)
+    query = dict(parse_qsl(parsed.query))
+    query['page'] = page_num
+    return urlunparse(parsed._replace(query=urlencode(query)))
 
 
 # ---------------- Logger Setup ----------------
@@ -92,116 +296,261 @@ def setup_logger(log_file: Optional[str] = None) -> logging.Logger:
 
 
 # ---------------- Database Helper ----------------
+@lru_cache(maxsize=200_000)
+def _normalize(url: str) -> str:
+    """Normalize website URL for comparison (memoized - the same URLs recur across pages and runs)"""
+    if not url:
+        return ""
+
+    url = url.lower().strip()
+    # Remove trailing slash
+    url = url.rstrip('/')
+    # Remove www.
+    url = url.replace('://www.', '://')
+    return url
+
+
+def _stored_spellings(normalized: str) -> Tuple[str, ...]:
+    """The case-insensitive spellings of a stored website that normalize to `normalized`"""
+    with_www = normalized.replace('://', '://www.', 1)
+    return (normalized, normalized + '/', with_www, with_www + '/')
+
+
 class LeadManager:
     """Manages Lead database operations with duplicate prevention"""
 
-    def __init__(self, logger: logging.Logger):
+    insert_batch_size = 500  # Rows per INSERT ... ON CONFLICT DO NOTHING statement
+
+    def __init__(self, logger: logging.Logger, batch_size: int = 10, source: str = "Clutch.co"):
         self.logger = logger
-        self.processed_websites: Set[str] = set()
+        self.source = source  # Scope of the Bloom preload and its DB confirmation, see known_leads()
+        self.batch_size = batch_size
+        self.lock = threading.RLock()  # Shared across scraper worker threads
+        self.pending: List[Lead] = []
+        self.pending_websites: Set[str] = set()
+        self.saved_websites: Set[str] = set()  # Websites this run actually inserted
+        self.bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
         self.load_existing_websites()
 
+    def known_leads(self):
+        """
+        Leads this manager dedups against in Python: its own source plus untagged rows
+        (CSV imports, and legacy rows from before Lead.source was restored). Other scraped
+        sources are left to uniq_lead_website at insert time.
+        """
+        return Lead.objects.filter(Q(source=self.source) | Q(source__isnull=True))
+
     def load_existing_websites(self):
-        """Load existing websites from database to prevent duplicates"""
+        """Load existing websites from database into the Bloom filter to prevent duplicates"""
         try:
-            existing = Lead.objects.values_list('website', flat=True)
-            self.processed_websites = set(url.lower().strip() for url in existing if url)
-            self.logger.info(f"📊 Loaded {len(self.processed_websites)} existing websites from database")
+            # values_list().iterator() streams through a server-side cursor on Postgres,
+            # so peak memory stays at one chunk instead of the whole column
+            existing = (
+                self.known_leads()
+                .exclude(website__isnull=True)
+                .exclude(website="")
+                .values_list('website', flat=True)
+                .iterator(chunk_size=2000)
+            )
+            for url in existing:
+                self.bloom.add(_normalize(url))
+            self.logger.info(f"📊 Loaded {len(self.bloom)} existing websites from database")
         except Exception as e:
             self.logger.error(f"Failed to load existing websites: {e}")
-            self.processed_websites = set()
+            self.bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
 
     def normalize_website(self, url: str) -> str:
         """Normalize website URL for comparison"""
-        if not url:
-            return ""
-
-        url = url.lower().strip()
-        # Remove trailing slash
-        url = url.rstrip('/')
-        # Remove www.
-        url = url.replace('://www.', '://')
-        return url
+        return _normalize(url)
 
     def is_duplicate(self, website: str) -> bool:
-        """Check if website already exists in database"""
+        """Check if website already exists in database (Bloom pre-check, DB confirms hits)"""
         normalized = self.normalize_website(website)
-        return normalized in self.processed_websites
+        if normalized in self.pending_websites:
+            return True
+        if normalized not in self.bloom:
+            return False
+        # Older rows were stored unnormalized; match every spelling _normalize() folds together
+        variants = Q()
+        for variant in _stored_spellings(normalized):
+            variants |= Q(website__iexact=variant)
+        return self.known_leads().filter(variants).exists()
 
     def save_lead(self, name: str, website: str, niche: str,
                   clutch_url: str = "", source: str = "Clutch.co") -> Tuple[bool, Optional[Lead]]:
         """
-        Save a single lead to database with validation
+        Validate a single lead and queue it for the next batch insert
         Returns: (success: bool, lead: Lead or None)
         """
-        try:
-            # Normalize and validate
-            website = self.normalize_website(website)
+        with self.lock:
+            try:
+                # Normalize once and validate
+                website = _normalize(website)
 
-            if not website or not name:
-                self.logger.debug(f"Invalid lead data: name={name}, website={website}")
-                return False, None
+                if not website or not name:
+                    self.logger.debug(f"Invalid lead data: name={name}, website={website}")
+                    return False, None
 
-            # Check for duplicates
-            if self.is_duplicate(website):
-                self.logger.debug(f"Duplicate website: {website}")
-                return False, None
+                # Check for duplicates
+                if self.is_duplicate(website):
+                    self.logger.debug(f"Duplicate website: {website}")
+                    return False, None
 
-            print('-----',clutch_url)
-            print('-----',website)
+                self.logger.debug(f"Queueing {website} (from {clutch_url})")
 
-
-            # Create lead with transaction
-            with transaction.atomic():
-                lead, created = Lead.objects.get_or_create(
+                # Buffer lead; written to the DB in batches by flush().
+                # created_at is filled by the model's auto_now_add.
+                lead = Lead(
+                    company=name.strip(),
                     website=website,
-                    defaults={
-                        'name': name.strip(),
-                        'source': source,
-                        'website': website.strip() if website else "",
-                        'created_at': datetime.now(),
-                        # Add any other fields your Lead model has
-                    }
+                    source=source,
                 )
+                self.pending.append(lead)
+                self.pending_websites.add(website)
+                self.logger.info(f"✅ Queued: {name} - {website}")
 
-                if created:
-                    self.processed_websites.add(website)
-                    self.logger.info(f"✅ Saved: {name} - {website}")
-                    return True, lead
-                else:
-                    self.logger.debug(f"Lead already exists: {website}")
-                    return False, lead
-
-        except IntegrityError as e:
-            self.logger.warning(f"Integrity error saving lead {name}: {e}")
-            return False, None
-        except ValidationError as e:
-            self.logger.warning(f"Validation error for {name}: {e}")
-            return False, None
-        except Exception as e:
-            self.logger.error(f"Unexpected error saving lead {name}: {e}")
-            return False, None
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+
+                return True, lead
+
+            except IntegrityError as e:
+                self.logger.warning(f"Integrity error saving lead {name}: {e}")
+                return False, None
+            except ValidationError as e:
+                self.logger.warning(f"Validation error for {name}: {e}")
+                return False, None
+            except Exception as e:
+                self.logger.error(f"Unexpected error saving lead {name}: {e}")
+                return False, None
 
     def save_leads_batch(self, leads_data: List[dict]) -> Tuple[int, int]:
         """
         Save multiple leads in a batch transaction
         Returns: (saved_count, skipped_count)
         """
-        saved = 0
-        skipped = 0
+        queued = []
 
         for lead_data in leads_data:
-            success, _ = self.save_lead(
+            success, lead = self.save_lead(
                 name=lead_data.get('name', ''),
                 website=lead_data.get('website', ''),
+                niche=lead_data.get('niche', ''),
                 source=lead_data.get('source', 'Clutch.co')
             )
 
             if success:
-                saved += 1
-            else:
-                skipped += 1
+                queued.append(lead.website)
 
-        return saved, skipped
+        self.flush()
+        saved = self.count_saved(queued)
+        return saved, len(leads_data) - saved
+
+    def count_saved(self, websites: List[str]) -> int:
+        """How many of these queued websites were actually inserted (call after flush)"""
+        with self.lock:
+            return sum(website in self.saved_websites for website in websites)
+
+    def flush(self) -> int:
+        """
+        Write buffered leads to database in a single bulk insert
+        Returns: number of leads inserted
+        """
+        with self.lock:
+            if not self.pending:
+                return 0
+
+            batch, self.pending = self.pending, []
+            self.pending_websites = set()
+
+            try:
+                # ON CONFLICT DO NOTHING doesn't report which rows it dropped, so first drop
+                # the ones uniq_lead_website would reject (scraped sources outside known_leads())
+                taken = set(
+                    Lead.objects
+                    .filter(source__in=SCRAPED_SOURCES, website__in=[lead.website for lead in batch])
+                    .values_list('website', flat=True)
+                )
+                fresh = [lead for lead in batch if not (lead.source in SCRAPED_SOURCES and lead.website in taken)]
+
+                # UNIQUE(website) + ON CONFLICT DO NOTHING: the DB has the final say on duplicates,
+                # so concurrent runs cannot double-insert; the Bloom filter is only a pre-filter.
+                # A concurrent run inserting the same site between the two statements is still counted.
+                Lead.objects.bulk_create(fresh, batch_size=self.insert_batch_size, ignore_conflicts=True)
+
+                for lead in batch:
+                    self.bloom.add(lead.website)
+                self.saved_websites.update(lead.website for lead in fresh)
+
+                self.logger.info(f"💾 Flushed {len(fresh)} leads to database ({len(batch) - len(fresh)} already stored)")
+                return len(fresh)
+
+            except Exception as e:
+                self.logger.error(f"Failed to flush {len(batch)} leads: {e}")
+                return 0
+
+
+# ---------------- Browser Pool ----------------
+class BrowserPool:
+    """Pool of pre-warmed Chrome drivers shared by scraper worker threads"""
+
+    def __init__(self, factory: Callable[[], webdriver.Remote], size: int,
+                 max_uses_per_instance: int, logger: logging.Logger):
+        self.factory = factory
+        self.max_uses_per_instance = max_uses_per_instance
+        self.logger = logger
+        self._idle: "queue.Queue[webdriver.Remote]" = queue.Queue()
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+        self.logger.info(f"🌐 Browser pool ready with {size} Chrome instance(s)")
+
+    def _spawn(self) -> webdriver.Remote:
+        driver = self.factory()
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def acquire(self) -> webdriver.Remote:
+        """Block until a driver is free and hand it out"""
+        return self._idle.get()
+
+    def release(self, driver: webdriver.Remote, pages_used: int = 0):
+        """Return a driver to the pool, recycling it once it has served enough pages"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + pages_used
+            self._uses[id(driver)] = uses
+
+        if uses >= self.max_uses_per_instance:
+            self.logger.info(f"♻️  Recycling Chrome instance after {uses} pages")
+            self._quit(driver)
+            try:
+                driver = self._spawn()
+            except Exception as e:
+                self.logger.error(f"Failed to replace recycled Chrome instance: {e}")
+                return
+
+        self._idle.put(driver)
+
+    def _quit(self, driver: webdriver.Remote):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Error closing Chrome instance: {e}")
+
+    def close_all(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
 
 
 # ---------------- Scraper Class ----------------
@@ -212,8 +561,9 @@ class ClutchScraperProd:
         self.config = config
         self.niche = niche
         self.logger = setup_logger(log_file)
-        self.driver: Optional[webdriver.Chrome] = None
-        self.lead_manager = LeadManager(self.logger)
+        self._local = threading.local()  # Per-thread driver handed out by the BrowserPool
+        self._stats_lock = threading.Lock()
+        self.lead_manager = LeadManager(self.logger, batch_size=config.save_batch_size)
         self.stats = {
             'pages_scraped': 0,
             'leads_found': 0,
@@ -222,7 +572,17 @@ class ClutchScraperProd:
             'errors': 0
         }
 
-    def setup_driver(self) -> webdriver.Chrome:
+    @property
+    def driver(self) -> Optional[webdriver.Remote]:
+        """Chrome driver owned by the current worker thread"""
+        return getattr(self._local, 'driver', None)
+
+    def _bump(self, key: str, amount: int = 1):
+        """Thread-safe stats counter increment"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def setup_driver(self) -> webdriver.Remote:
         """Initialize Chrome driver with production settings"""
         self.logger.info("🚀 Setting up Chrome driver...")
 
@@ -244,16 +604,18 @@ class ClutchScraperProd:
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-images")  # Faster loading
-        chrome_options.add_argument("--disable-javascript-harmony")
 
         # Memory optimization
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-software-rasterizer")
 
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = PooledChrome(
+                Service(_driver_path()),
+                chrome_options,
+                pool_maxsize=self.config.pool_size * 2,
+                timeout=self.config.command_timeout,
+            )
 
             # Stealth JavaScript injection
             driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -271,6 +633,13 @@ class ClutchScraperProd:
                 '''
             })
 
+            # smart_scroll runs as one async script covering five scroll pauses
+            driver.set_script_timeout(max(30, int(self.config.scroll_pause * 5) + 10))
+
+            # Block images, fonts, media and stylesheets - only the HTML is scraped
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(_BLOCKED_RESOURCE_URLS)})
+
             self.logger.info("✅ Chrome driver initialized")
             return driver
 
@@ -312,49 +681,30 @@ class ClutchScraperProd:
         if not url:
             return False
 
-        # Exclude social media and non-business domains
-        excluded_domains = {
-            'facebook.com', 'fb.com', 'twitter.com', 'x.com', 'linkedin.com',
-            'instagram.com', 'youtube.com', 'youtu.be', 'tiktok.com',
-            'pinterest.com', 'behance.net', 'dribbble.com', 'github.com',
-            'clutch.co', 'goodfirms.co', 'upwork.com', 'fiverr.com',
-            'mailto:', 'tel:', 'javascript:'
-        }
-
         try:
             parsed = urlparse(url.lower())
-            domain = parsed.netloc.replace('www.', '')
-
-            # Check if domain is in excluded list
-            for excluded in excluded_domains:
-                if excluded in domain:
-                    return False
 
             # Must have valid scheme
-            if parsed.scheme not in ['http', 'https']:
-                return False
-
-            # Must have a domain
-            if not domain or '.' not in domain:
+            if parsed.scheme not in ('http', 'https'):
                 return False
 
-            return True
+            # Must have a domain that is not in the excluded list
+            domain = parsed.netloc.removeprefix('www.')
+            return bool(domain) and '.' in domain and not _EXCLUDED_RE.search(domain)
 
         except Exception:
             return False
 
     def handle_captcha_detection(self) -> bool:
         """Detect and handle CAPTCHA challenges"""
+        # Cheap in-page probe first; only pull the full page source when it fires
+        if not self.driver.execute_script(_CAPTCHA_PROBE_JS):
+            return True
+
         page_source = self.driver.page_source.lower()
         page_title = self.driver.title.lower()
 
-        captcha_indicators = [
-            'captcha', 'verify you are human', 'complete the action',
-            'cloudflare', 'please verify', 'security check',
-            'human verification', 'prove you are human'
-        ]
-
-        if any(indicator in page_source or indicator in page_title for indicator in captcha_indicators):
+        if any(indicator in page_source or indicator in page_title for indicator in _CAPTCHA_INDICATORS):
             self.logger.warning("🤖 CAPTCHA detected!")
             self.logger.info(f"Page title: {self.driver.title}")
             self.logger.info(f"Current URL: {self.driver.current_url}")
@@ -367,7 +717,7 @@ class ClutchScraperProd:
                 for i in range(60, 0, -5):
                     time.sleep(5)
                     current_title = self.driver.title.lower()
-                    if not any(indicator in current_title for indicator in captcha_indicators):
+                    if not any(indicator in current_title for indicator in _CAPTCHA_INDICATORS):
                         self.logger.info("✅ CAPTCHA appears to be resolved!")
                         return True
                     self.logger.info(f"⏳ Still waiting... {i - 5} seconds remaining")
@@ -380,173 +730,92 @@ class ClutchScraperProd:
 
         return True  # No CAPTCHA detected
 
-    def smart_scroll(self):
-        """Intelligent scrolling to trigger lazy loading"""
-        try:
-            # Get page height
-            total_height = self.driver.execute_script("return document.body.scrollHeight")
-
-            # Scroll in segments
-            scroll_positions = [0.25, 0.5, 0.75, 1.0]
+    def wait_for_page_ready(self):
+        """Wait for the document to finish loading and cards to render, instead of a flat sleep"""
+        WebDriverWait(self.driver, self.config.element_timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
 
-            for position in scroll_positions:
-                scroll_to = int(total_height * position)
-                self.driver.execute_script(f"window.scrollTo(0, {scroll_to});")
-                time.sleep(self.config.scroll_pause)
+        try:
+            WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _CARD_SELECTOR_CSS))
+            )
+        except TimeoutException:
+            # No cards yet (CAPTCHA or empty page) - let the checks that follow decide
+            self.logger.debug("No provider cards rendered within 5s")
 
-            # Scroll back to top
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(self.config.scroll_pause)
+        # Small jitter for rate-limit politeness, not as a load barrier
+        time.sleep(random.uniform(0.5, 1.5))
 
+    def smart_scroll(self):
+        """Intelligent scrolling to trigger lazy loading, in a single WebDriver round-trip"""
+        try:
+            self.driver.execute_async_script(_SMART_SCROLL_JS, self.config.scroll_pause)
         except Exception as e:
             self.logger.debug(f"Scroll error: {e}")
 
-    def find_business_cards(self) -> Tuple[List, Optional[str]]:
-        """Locate business card elements with multiple strategies"""
-
-        # Primary selectors (based on current Clutch structure)
-        selectors = [
-            ".provider",
-            "li.provider",
-            ".provider-item",
-            ".directory-providers .provider",
-            "[data-provider-id]",
-            ".company-listing",
-            "article.provider"
-        ]
-
-        for selector in selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements and len(elements) > 0:
-                    self.logger.info(f"✅ Found {len(elements)} cards with: {selector}")
-                    return elements, selector
-            except Exception as e:
-                self.logger.debug(f"Selector '{selector}' failed: {e}")
-
-        # Fallback: find by website links
+    def extract_business_cards(self) -> Tuple[List[dict], Optional[str]]:
+        """Extract raw card data for the whole page with a single execute_script call"""
         try:
-            website_links = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "a[href*='redirect'][title*='Visit'], a.website-link__item"
-            )
-
-            if website_links:
-                cards = []
-                for link in website_links:
-                    try:
-                        parent = link.find_element(
-                            By.XPATH,
-                            "./ancestor::*[contains(@class, 'provider') or contains(@class, 'listing')][1]"
-                        )
-                        if parent not in cards:
-                            cards.append(parent)
-                    except:
-                        pass
-
-                if cards:
-                    self.logger.info(f"✅ Found {len(cards)} cards via fallback method")
-                    return cards, "fallback-website-links"
-
+            result = self.driver.execute_script(
+                _EXTRACT_CARDS_JS,
+                list(_CARD_SELECTORS),
+                list(_NAME_SELECTORS),
+                list(_WEBSITE_SELECTORS),
+                _FALLBACK_LINK_SELECTOR,
+            ) or {}
         except Exception as e:
-            self.logger.debug(f"Fallback method failed: {e}")
+            self.logger.debug(f"Card extraction script failed: {e}")
+            result = {}
+
+        rows = result.get('rows') or []
+        if rows:
+            self.logger.info(f"✅ Found {len(rows)} cards with: {result.get('selector')}")
+            return rows, result.get('selector')
 
         self.logger.warning("❌ No business cards found")
         return [], None
 
-    def extract_business_data(self, card) -> Optional[dict]:
-        """Extract business information from card element with retry logic"""
-        max_attempts = 2
+    def parse_business_row(self, row: dict) -> Optional[dict]:
+        """Turn a raw card row into business data, resolving the real website"""
+        business_name = (row.get('name') or "").strip()
+        if not business_name:
+            return None
 
-        for attempt in range(max_attempts):
-            try:
-                # Extract business name
-                name_selectors = [
-                    "h3.provider__name a",
-                    ".provider__name a",
-                    "h3 a[href*='/profile/']",
-                    ".company-name a",
-                    "h2 a"
-                ]
-
-                name_element = None
-                for selector in name_selectors:
-                    try:
-                        name_element = card.find_element(By.CSS_SELECTOR, selector)
-                        if name_element and name_element.text.strip():
-                            break
-                    except NoSuchElementException:
-                        continue
-
-                if not name_element:
-                    return None
-
-                business_name = name_element.text.strip()
-                clutch_profile = name_element.get_attribute('href') or ""
-
-                # Extract website URL
-                website_selectors = [
-                    "a.provider__cta-link.website-link__item[href*='redirect']",
-                    "a[href*='redirect'][title*='Visit']",
-                    ".website-link__item[href*='redirect']",
-                    "a.visit-website"
-                ]
-
-                website_url = None
-                for selector in website_selectors:
-                    try:
-                        website_elem = card.find_element(By.CSS_SELECTOR, selector)
-                        redirect_url = website_elem.get_attribute('href')
-                        if redirect_url:
-                            website_url = self.extract_real_website(redirect_url)
-                            if website_url:
-                                break
-                    except NoSuchElementException:
-                        continue
+        redirect_url = row.get('redirect')
+        website_url = self.extract_real_website(redirect_url) if redirect_url else None
 
-                if not website_url or not self.is_valid_website(website_url):
-                    self.logger.debug(f"Invalid/missing website for: {business_name}")
-                    return None
-
-                return {
-                    'name': business_name,
-                    'website': website_url,
-                    'clutch_url': clutch_profile,
-                    'niche': self.niche
-                }
-
-            except StaleElementReferenceException:
-                if attempt < max_attempts - 1:
-                    self.logger.debug(f"Stale element, retry {attempt + 1}")
-                    time.sleep(1)
-                    continue
-                else:
-                    return None
-            except Exception as e:
-                self.logger.debug(f"Error extracting business data: {e}")
-                return None
+        if not website_url or not self.is_valid_website(website_url):
+            self.logger.debug(f"Invalid/missing website for: {business_name}")
+            return None
 
-        return None
+        return {
+            'name': business_name,
+            'website': website_url,
+            'clutch_url': row.get('profile') or "",
+            'niche': self.niche
+        }
 
     def scrape_page(self, url: str, page_num: int) -> int:
-        """Scrape a single page and save leads to database"""
+        """Scrape a single page and save leads to database; returns leads actually inserted"""
         self.logger.info(f"📄 Scraping page {page_num}: {url}")
         leads_saved = 0
+        queued: List[str] = []
 
         try:
             self.driver.get(url)
-            time.sleep(self.config.page_delay)
+            self.wait_for_page_ready()
 
             # Handle CAPTCHA
             if not self.handle_captcha_detection():
-                self.stats['errors'] += 1
+                self._bump('errors')
                 return 0
 
             # Smart scrolling
             self.smart_scroll()
 
-            # Find business cards
-            cards, selector = self.find_business_cards()
+            # Extract business cards
+            cards, selector = self.extract_business_cards()
 
             if not cards:
                 self.logger.warning(f"No cards found on page {page_num}")
@@ -557,12 +826,12 @@ class ClutchScraperProd:
             # Process cards
             for idx, card in enumerate(cards, 1):
                 try:
-                    business_data = self.extract_business_data(card)
+                    business_data = self.parse_business_row(card)
 
                     if not business_data:
                         continue
 
-                    self.stats['leads_found'] += 1
+                    self._bump('leads_found')
 
                     # Save to database
                     success, lead = self.lead_manager.save_lead(
@@ -573,24 +842,31 @@ class ClutchScraperProd:
                     )
 
                     if success:
-                        leads_saved += 1
-                        self.stats['leads_saved'] += 1
+                        queued.append(lead.website)
                     else:
-                        self.stats['duplicates_skipped'] += 1
+                        self._bump('duplicates_skipped')
 
                 except Exception as e:
                     self.logger.error(f"Error processing card {idx}: {e}")
-                    self.stats['errors'] += 1
+                    self._bump('errors')
                     continue
 
-            self.stats['pages_scraped'] += 1
+            self._bump('pages_scraped')
+            self._local.pages += 1
 
         except TimeoutException:
             self.logger.error(f"Timeout on page {page_num}")
-            self.stats['errors'] += 1
+            self._bump('errors')
         except Exception as e:
             self.logger.error(f"Error scraping page {page_num}: {e}")
-            self.stats['errors'] += 1
+            self._bump('errors')
+
+        # Flush the page so its count reflects inserted rows, not queued ones
+        if queued:
+            self.lead_manager.flush()
+            leads_saved = self.lead_manager.count_saved(queued)
+            self._bump('leads_saved', leads_saved)
+            self._bump('duplicates_skipped', len(queued) - leads_saved)
 
         return leads_saved
 
@@ -599,13 +875,10 @@ class ClutchScraperProd:
         self.logger.info(f"🎯 Starting scrape for niche: {self.niche}")
         self.logger.info(f"🔗 Base URL: {base_url}")
 
-        for page_num in range(1, self.config.max_pages + 1):
-            # Construct paginated URL
-            if page_num == 1:
-                url = base_url
-            else:
-                separator = "&" if "?" in base_url else "?"
-                url = f"{base_url}{separator}page={page_num}"
+        # Build every paginated URL up front (replaces any existing page= param)
+        page_urls = [base_url] + [_page_url(base_url, n) for n in range(2, self.config.max_pages + 1)]
+
+        for page_num, url in enumerate(page_urls, 1):
 
             # Scrape page with retry logic
             for retry in range(self.config.max_retries):
@@ -621,10 +894,11 @@ class ClutchScraperProd:
                 except Exception as e:
                     if retry < self.config.max_retries - 1:
                         self.logger.warning(f"Retry {retry + 1}/{self.config.max_retries} after error: {e}")
-                        time.sleep(self.config.retry_delay)
+                        # Exponential backoff with jitter so pool workers don't retry in lockstep
+                        time.sleep(min(self.config.retry_delay * (2 ** retry), 60) + random.uniform(0, 2))
                     else:
                         self.logger.error(f"Failed after {self.config.max_retries} retries: {e}")
-                        self.stats['errors'] += 1
+                        self._bump('errors')
 
             # Delay between pages
             time.sleep(self.config.page_delay)
@@ -635,12 +909,22 @@ class ClutchScraperProd:
         """Main execution method"""
         start_time = datetime.now()
 
+        pool = None
+
         try:
-            self.driver = self.setup_driver()
-            self.logger.info(f"🚀 Starting scrape for {len(niche_urls)} URL(s)")
+            pool_size = max(1, min(self.config.pool_size, len(niche_urls)))
+            pool = BrowserPool(
+                factory=self.setup_driver,
+                size=pool_size,
+                max_uses_per_instance=self.config.max_uses_per_instance,
+                logger=self.logger
+            )
+            self.logger.info(f"🚀 Starting scrape for {len(niche_urls)} URL(s) with {pool_size} worker(s)")
 
-            for url in niche_urls:
-                self.scrape_niche_url(url)
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                futures = [executor.submit(self._scrape_with_pool, pool, url) for url in niche_urls]
+                for future in futures:
+                    future.result()
 
             # Final statistics
             duration = (datetime.now() - start_time).total_seconds()
@@ -664,9 +948,23 @@ class ClutchScraperProd:
             self.logger.error(f"💥 Critical error: {e}", exc_info=True)
             raise
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("🚪 Browser closed")
+            self.lead_manager.flush()
+            if pool:
+                pool.close_all()
+                self.logger.info("🚪 Browsers closed")
+
+    def _scrape_with_pool(self, pool: BrowserPool, url: str):
+        """Worker: borrow a driver from the pool and scrape one niche URL with it"""
+        driver = pool.acquire()
+        self._local.driver = driver
+        self._local.pages = 0
+
+        try:
+            self.scrape_niche_url(url)
+        finally:
+            self._local.driver = None
+            pool.release(driver, pages_used=self._local.pages)
+            connection.close()  # Each worker thread holds its own DB connection
 
 
 # ---------------- CLI Interface ----------------
@@ -698,6 +996,12 @@ def main():
         action='store_true',
         help='Run in headless mode'
     )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        default=1,
+        help='Chrome instances scraping URLs in parallel (default: 1)'
+    )
     parser.add_argument(
         '--log-file',
         help='Log file path (optional)'
@@ -717,7 +1021,8 @@ def main():
         max_pages=args.max_pages,
         headless=args.headless,
         page_delay=5.0,
-        element_timeout=20
+        element_timeout=20,
+        pool_size=args.pool_size
     )
 
     # Initialize and run scraper
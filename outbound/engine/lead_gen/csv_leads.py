@@ -1,7 +1,13 @@
 import os
 import sys
 import csv
-from django.db import transaction
+import mmap
+import codecs
+import queue
+import logging
+import threading
+from django.db import connection
+from django.db.models.functions import Lower
 
 # ------------------------------------------
 # Django Setup
@@ -10,14 +16,17 @@ print("🔧 Setting up Django environment...")
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, PROJECT_ROOT)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")
 
 import django
 django.setup()
 
 print("✅ Django setup complete.")
 
-from system.models import Lead  # adjust if app name differs
+from outbound.models import Lead
+from outbound.engine.utils import ScalableBloomFilter
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------------------------------
@@ -45,122 +54,199 @@ FIELD_MAP = {
 
 print("📄 Field mapping loaded.")
 
+# Rows per INSERT statement; the import_csv_leads batch_size only controls
+# how many Lead objects are buffered in Python before each flush.
+INSERT_BATCH_SIZE = 1000
+
+
+# ------------------------------------------
+# CSV Reading
+# ------------------------------------------
+def _mmap_lines(f):
+    """Yield decoded lines straight from a read-only memory map of the open CSV file"""
+    if os.fstat(f.fileno()).st_size == 0:
+        return
+
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:3] == codecs.BOM_UTF8:
+            mm.seek(3)
+        for line in iter(mm.readline, b""):
+            yield line.decode("utf-8")
+
+
+# ------------------------------------------
+# DB Writer Thread
+# ------------------------------------------
+def _insert_worker(write_queue, counts):
+    """Drain Lead batches from write_queue into the DB until a None sentinel arrives"""
+    try:
+        while True:
+            batch = write_queue.get()
+            if batch is None:
+                break
+
+            try:
+                # ON CONFLICT DO NOTHING doesn't report which rows it dropped, so the
+                # emails uniq_lead_email would reject are looked up and left out first.
+                # Rows another importer commits between the two statements are still counted.
+                taken = set(
+                    Lead.objects.annotate(email_lower=Lower("email"))
+                    .filter(email_lower__in=[lead.email for lead in batch])
+                    .values_list("email_lower", flat=True)
+                )
+                fresh = [lead for lead in batch if lead.email not in taken]
+                Lead.objects.bulk_create(fresh, batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True)
+                counts["inserted"] += len(fresh)
+                counts["duplicates"] += len(batch) - len(fresh)
+                logger.info("📤 %d leads inserted so far", counts["inserted"])
+            except Exception as e:
+                counts["errors"] += len(batch)
+                logger.error("❌ Failed to insert batch of %d leads: %s", len(batch), e)
+    finally:
+        # The thread got its own DB connection from Django; don't leak it
+        connection.close()
+
 
 # ------------------------------------------
 # Import Function
 # ------------------------------------------
-def import_csv_leads(input_file, batch_size=500):
+def import_csv_leads(input_file, batch_size=10000):
 
-    print("\n🚀 Starting CSV import process...")
-    print(f"📁 CSV Input File: {input_file}")
+    logger.info("🚀 Starting CSV import process...")
+    logger.info("📁 CSV Input File: %s", input_file)
 
     leads_to_create = []
     total_rows = 0
-    inserted = 0
-    duplicates = 0
     errors = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-    print("🔍 Opening CSV file...")
+    # Bloom filter of known emails lets most duplicates skip Lead construction without
+    # holding every email string in memory; only its rare false positives hit the DB
+    logger.info("🔍 Loading existing emails into Bloom filter...")
+    known_emails = ScalableBloomFilter(initial_capacity=2_000_000, error_rate=1e-4)
+    for existing in (
+        Lead.objects.exclude(email__isnull=True)
+        .values_list("email", flat=True).iterator(chunk_size=2000)
+    ):
+        known_emails.add(existing.lower())
+    logger.info("📥 %d existing emails loaded.", len(known_emails))
+    skipped = 0
 
-    with open(input_file, mode="r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        print("📌 CSV headers detected:", reader.fieldnames)
+    # Parsing continues on this thread while the writer thread commits the previous batch
+    counts = {"inserted": 0, "duplicates": 0, "errors": 0}
+    write_queue = queue.Queue(maxsize=2)
+    writer = threading.Thread(target=_insert_worker, args=(write_queue, counts), daemon=True)
+    writer.start()
 
-        for row in reader:
-            total_rows += 1
-            print(f"\n--- Processing row #{total_rows} ---")
+    try:
+        with open(input_file, mode="rb") as f:
+            # Plain csv.reader + header positions: no per-row dict like DictReader builds
+            reader = csv.reader(_mmap_lines(f))
+            headers = next(reader, [])
+            logger.info("📌 CSV headers detected: %s", headers)
 
-            try:
-                email = (row.get("Email") or "").strip().lower()
-
-                # ---------------------------
-                # Duplicate Check
-                # ---------------------------
-                if email:
-                    print(f"🔎 Checking for duplicate email: {email}")
-                    if Lead.objects.filter(email=email).exists():
-                        duplicates += 1
-                        print("⚠️ Duplicate found → Skipping this row.")
+            idx = {header: i for i, header in enumerate(headers)}
+            width = len(headers)
+            email_idx = idx.get("Email")
+            emp_idx = idx.get("# Employees")
+            # (column index, model field) pairs resolved once; missing columns fall back to the model default
+            mapping = tuple(
+                (idx[csv_col], model_field)
+                for csv_col, model_field in FIELD_MAP.items()
+                if csv_col in idx and model_field != "employees"
+            )
+
+            for row in reader:
+                total_rows += 1
+
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+
+                try:
+                    email = row[email_idx].strip().lower() if email_idx is not None else ""
+
+                    if not email:
+                        errors += 1
+                        if debug:
+                            logger.debug("⚠️ Row #%d has no email → skipped", total_rows)
                         continue
-                else:
-                    print("⚠️ No email found → Skipping row.")
+
+                    # ---------------------------
+                    # Duplicate Check
+                    # ---------------------------
+                    if email in known_emails and Lead.objects.filter(email=email).exists():
+                        skipped += 1
+                        if debug:
+                            logger.debug("⚠️ Row #%d duplicate email %s → skipped", total_rows, email)
+                        continue
+
+                    # ---------------------------
+                    # Field Mapping
+                    # ---------------------------
+                    lead_data = {model_field: row[i].strip() or None for i, model_field in mapping}
+                    # Stored lowercased so the exact-match exists() above sees case variants
+                    lead_data["email"] = email
+
+                    if debug:
+                        logger.debug("🗺️ Row #%d mapped: %s", total_rows, lead_data)
+
+                    # ---------------------------
+                    # Parse Employees (int)
+                    # ---------------------------
+                    emp = row[emp_idx].strip() if emp_idx is not None else ""
+                    lead_data["employees"] = int(emp) if emp.isdigit() else None
+
+                    # ---------------------------
+                    # Always default score
+                    # ---------------------------
+                    lead_data["score"] = False
+
+                    leads_to_create.append(Lead(**lead_data))
+                    known_emails.add(email)
+
+                    # ---------------------------
+                    # Batch insert
+                    # ---------------------------
+                    if len(leads_to_create) >= batch_size:
+                        write_queue.put(leads_to_create)
+                        leads_to_create = []
+                        logger.info("📤 %d rows read, batch queued for insert", total_rows)
+
+                except Exception as e:
                     errors += 1
+                    logger.warning("❌ ERROR processing row #%d: %s", total_rows, e)
                     continue
 
-                # ---------------------------
-                # Field Mapping
-                # ---------------------------
-                lead_data = {}
-                print("🗺️ Mapping CSV fields into model fields...")
-                for csv_col, model_field in FIELD_MAP.items():
-                    value = row.get(csv_col, "").strip()
-                    print(f"   {csv_col} → {model_field} = {value}")
-                    lead_data[model_field] = value or None
-
-                # ---------------------------
-                # Parse Employees (int)
-                # ---------------------------
-                emp = (row.get("# Employees") or "").strip()
-                print(f"👥 Raw employees value: {emp}")
-
-                if emp.isdigit():
-                    lead_data["employees"] = int(emp)
-                    print(f"   ➝ Parsed employees: {lead_data['employees']}")
-                else:
-                    lead_data["employees"] = None
-                    print("   ➝ Invalid employees value → Set to None")
-
-                # ---------------------------
-                # Always default score
-                # ---------------------------
-                lead_data["score"] = False
-                print("📌 score=False assigned.")
-
-                # ---------------------------
-                # Create model instance
-                # ---------------------------
-                print("📦 Creating Lead instance (not saved yet)...")
-                leads_to_create.append(Lead(**lead_data))
-
-                # ---------------------------
-                # Batch insert
-                # ---------------------------
-                if len(leads_to_create) >= batch_size:
-                    print(f"📤 Inserting batch of {len(leads_to_create)} leads into DB...")
-                    Lead.objects.bulk_create(leads_to_create)
-                    inserted += len(leads_to_create)
-                    leads_to_create = []
-                    print("✅ Batch insert complete.")
+            # Final leftover batch
+            if leads_to_create:
+                write_queue.put(leads_to_create)
+                logger.info("📤 Final batch of %d leads queued", len(leads_to_create))
 
-            except Exception as e:
-                errors += 1
-                print(f"❌ ERROR processing row #{total_rows}: {e}")
-                continue
+    finally:
+        write_queue.put(None)
+        writer.join()
 
-        # Final leftover batch
-        if leads_to_create:
-            print(f"\n📤 Inserting final batch of {len(leads_to_create)} leads...")
-            Lead.objects.bulk_create(leads_to_create)
-            inserted += len(leads_to_create)
-            print("✅ Final batch insert complete.")
+    errors += counts["errors"]
+    inserted = counts["inserted"]
+    duplicates = skipped + counts["duplicates"]
 
     # ------------------------------------------
     # Summary Report
     # ------------------------------------------
-    print("\n🎉 CSV IMPORT SUMMARY")
-    print("-----------------------------")
-    print(f"📌 Total Rows Read: {total_rows}")
-    print(f"📥 Successfully Inserted: {inserted}")
-    print(f"♻️ Duplicates Skipped: {duplicates}")
-    print(f"⚠️ Errors / Bad Rows: {errors}")
-    print("-----------------------------")
-    print("🚀 Import process finished.\n")
+    logger.info("🎉 CSV IMPORT SUMMARY")
+    logger.info("📌 Total Rows Read: %d", total_rows)
+    logger.info("📥 Successfully Inserted: %d", inserted)
+    logger.info("♻️ Duplicates Skipped: %d", duplicates)
+    logger.info("⚠️ Errors / Bad Rows: %d", errors)
+
+    return {"rows": total_rows, "inserted": inserted, "duplicates": duplicates, "errors": errors}
 
 
 # ------------------------------------------
 # Run Import
 # ------------------------------------------
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
     input_file = os.path.join(
         PROJECT_ROOT,
@@ -256,9 +256,11 @@ def update_lead_with_email(lead_id, email, description):
     """Update lead with scraped email and description"""
     lead = Lead.objects.get(lead_id=lead_id)
     lead.email = email
+    update_fields = ["email"]
     if description:
         lead.note = description
-    lead.save()
+        update_fields.append("note")
+    lead.save(update_fields=update_fields)
     return lead
 
 
@@ -1,25 +1,24 @@
 """
 Lead Scoring Script - Production Version
 
-This script processes unverified leads using OpenAI's GPT model to score them
-based on fit and intent, then creates verified lead records.
+This script processes unscored leads using OpenAI's GPT model to score them
+based on fit and intent, then writes the result to each Lead's scoring fields.
 
 Usage:
-    python score_leads.py [--batch-size BATCH_SIZE] [--icp-id ICP_ID] [--dry-run]
+    python score_leads.py [--batch-size BATCH_SIZE] [--icp-id ICP_ID] [--max-concurrency N] [--dry-run]
 """
 
 import os
 import sys
 import json
+import asyncio
 import logging
+import logging.handlers
 import argparse
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
 from dataclasses import dataclass
 
 from django.db import transaction
-from django.db.models import QuerySet
-from django.core.exceptions import ValidationError
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -34,8 +33,12 @@ import django
 
 django.setup()
 
-from openai import OpenAI, OpenAIError
-from outbound.models import Lead, VerifiedLead, ICP
+from openai import AsyncOpenAI, OpenAIError
+from outbound.engine.utils import openai_async_http_client
+from outbound.models import Lead, ICP
+
+# Lead.intent for a GPT intent_score: first band whose floor the score reaches
+INTENT_BANDS = ((7, "HIGH"), (4, "MEDIUM"), (0, "LOW"))
 
 
 # Configuration
@@ -49,6 +52,9 @@ class Config:
     max_tokens: int = 2000
     max_retries: int = 3
     timeout: int = 60
+    leads_per_request: int = 10
+    max_concurrency: int = 8
+    min_fit_score: int = 6  # fit_score at or above this sets Lead.score
 
 
 # Logging setup
@@ -57,14 +63,13 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     log_dir = os.path.join(PROJECT_ROOT, 'logs')
     os.makedirs(log_dir, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(log_dir, f'lead_scoring_{timestamp}.log')
+    log_file = os.path.join(log_dir, 'lead_scoring.log')
 
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
+            logging.handlers.RotatingFileHandler(log_file, maxBytes=50_000_000, backupCount=5),
             logging.StreamHandler(sys.stdout)
         ]
     )
@@ -74,7 +79,7 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     return logger
 
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
 
 class LeadScoringError(Exception):
@@ -93,7 +98,7 @@ class LeadScorer:
     def __init__(self, config: Config, dry_run: bool = False):
         self.config = config
         self.dry_run = dry_run
-        self.client: Optional[OpenAI] = None
+        self.client: Optional[AsyncOpenAI] = None
         self.icp: Optional[ICP] = None
 
         self._initialize_openai_client()
@@ -106,7 +111,11 @@ class LeadScorer:
             raise LeadScoringError("OPENAI_API_KEY not found in environment variables")
 
         try:
-            self.client = OpenAI(api_key=api_key, timeout=self.config.timeout)
+            self.client = AsyncOpenAI(
+                api_key=api_key,
+                timeout=self.config.timeout,
+                http_client=openai_async_http_client(self.config.timeout),
+            )
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             raise LeadScoringError(f"Failed to initialize OpenAI client: {e}")
@@ -129,18 +138,22 @@ class LeadScorer:
         except Exception as e:
             raise LeadScoringError(f"Error fetching ICP: {e}")
 
-    def fetch_leads(self) -> QuerySet:
-        """Fetch batch of unverified leads with email"""
+    def fetch_leads(self) -> List[Lead]:
+        """Fetch batch of unscored leads with email"""
         try:
-            leads = Lead.objects.filter(
-                verified=False,
-                email__isnull=False
-            ).exclude(
-                email__exact=''
-            ).order_by('created_at')[:self.config.batch_size]
+            # Materialize once with just the prompt columns so nothing re-queries downstream
+            leads = list(
+                Lead.objects.filter(
+                    score_reason__isnull=True,
+                    email__isnull=False
+                ).exclude(
+                    email__exact=''
+                ).only(
+                    'id', 'first_name', 'last_name', 'company', 'email', 'website', 'source'
+                ).order_by('created_at')[:self.config.batch_size]
+            )
 
-            lead_count = len(leads)
-            logger.info(f"Fetched {lead_count} unverified leads for processing")
+            logger.info(f"Fetched {len(leads)} unscored leads for processing")
 
             return leads
 
@@ -151,7 +164,7 @@ class LeadScorer:
         """Generate GPT prompt for lead scoring"""
         leads_payload = [
             {
-                "name": lead.name or "N/A",
+                "name": " ".join(filter(None, [lead.first_name, lead.last_name])) or lead.company or "N/A",
                 "email": lead.email,
                 "website": lead.website or "N/A",
                 "source": lead.source or "unknown"
@@ -205,12 +218,12 @@ Remember: Return ONLY the JSON array, nothing else."""
         logger.debug(f"Generated prompt for {len(leads)} leads")
         return prompt
 
-    def call_gpt(self, prompt: str, retry_count: int = 0) -> List[Dict]:
+    async def call_gpt(self, prompt: str, retry_count: int = 0) -> List[Dict]:
         """Call GPT API with retry logic"""
         try:
             logger.info(f"Calling GPT API (attempt {retry_count + 1}/{self.config.max_retries})")
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.config.model,
                 messages=[
                     {
@@ -241,7 +254,7 @@ Remember: Return ONLY the JSON array, nothing else."""
 
             if retry_count < self.config.max_retries - 1:
                 logger.info(f"Retrying... ({retry_count + 1}/{self.config.max_retries})")
-                return self.call_gpt(prompt, retry_count + 1)
+                return await self.call_gpt(prompt, retry_count + 1)
             else:
                 raise GPTProcessingError(f"GPT API failed after {self.config.max_retries} attempts: {e}")
 
@@ -292,8 +305,8 @@ Remember: Return ONLY the JSON array, nothing else."""
 
         return data
 
-    def save_verified_leads(self, leads_data: List[Dict], raw_leads: List[Lead]) -> Tuple[int, int]:
-        """Save verified leads to database"""
+    def save_scores(self, leads_data: List[Dict], raw_leads: List[Lead]) -> Tuple[int, int]:
+        """Write GPT scores onto the matching Lead rows"""
         success_count = 0
         error_count = 0
 
@@ -301,41 +314,67 @@ Remember: Return ONLY the JSON array, nothing else."""
             logger.info("DRY RUN MODE - No database changes will be made")
             for lead_data in leads_data:
                 logger.info(
-                    f"Would save: {lead_data['name']} - Fit: {lead_data['fit_score']}, Intent: {lead_data['intent_score']}")
+                    f"Would save: {lead_data.get('email')} - Fit: {lead_data.get('fit_score')}, "
+                    f"Intent: {lead_data.get('intent_score')}")
             return len(leads_data), 0
 
-        with transaction.atomic():
-            for lead_data, raw_lead in zip(leads_data, raw_leads):
-                try:
-                    verified_lead = VerifiedLead.objects.create(
-                        name=lead_data.get("name", raw_lead.name),
-                        email=lead_data["email"],
-                        website=lead_data.get("website") or raw_lead.website,
-                        source=lead_data.get("source") or raw_lead.source,
-                        fit_score=lead_data.get("fit_score", 0),
-                        intent_score=lead_data.get("intent_score", 0),
-                        personalization_note=lead_data.get("personalization_note", ""),
-                    )
+        # GPT may reorder or drop leads, so results are matched back by email
+        by_email = {lead.email.lower(): lead for lead in raw_leads}
+
+        # Validate everything up front so no error is raised inside the transaction
+        scored: List[Lead] = []
+
+        for lead_data in leads_data:
+            try:
+                raw_lead = by_email.pop(str(lead_data["email"]).lower())
+                fit_score = int(lead_data.get("fit_score", 0))
+                intent_score = int(lead_data.get("intent_score", 0))
+            except KeyError:
+                error_count += 1
+                logger.warning(f"GPT returned a lead that wasn't sent: {lead_data.get('email')}")
+                continue
+            except (TypeError, ValueError) as e:
+                error_count += 1
+                logger.warning(f"Invalid scores for lead {lead_data.get('email')}: {e}")
+                continue
+
+            raw_lead.score = fit_score >= self.config.min_fit_score
+            raw_lead.intent = next(intent for floor, intent in INTENT_BANDS if intent_score >= floor)
+            raw_lead.score_reason = (
+                f"Fit {fit_score}/10, intent {intent_score}/10: {lead_data.get('personalization_note', '')}"
+            )
+            scored.append(raw_lead)
 
-                    raw_lead.verified = True
-                    raw_lead.save()
+        # Leads GPT left out stay unscored and are picked up by the next run
+        error_count += len(by_email)
 
-                    success_count += 1
-                    logger.info(
-                        f"Saved verified lead: {verified_lead.name} ({verified_lead.email}) - "
-                        f"Fit: {verified_lead.fit_score}, Intent: {verified_lead.intent_score}"
-                    )
+        if not scored:
+            return 0, error_count
+
+        try:
+            with transaction.atomic():
+                Lead.objects.bulk_update(scored, ["score", "intent", "score_reason"], batch_size=500)
 
-                except ValidationError as e:
-                    error_count += 1
-                    logger.error(f"Validation error saving lead {lead_data.get('email')}: {e}")
+        except Exception as e:
+            logger.error(f"Error saving scores for {len(scored)} leads: {e}")
+            return 0, error_count + len(scored)
 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error saving lead {lead_data.get('email')}: {e}")
+        success_count = len(scored)
+        for lead in scored:
+            logger.info(f"Scored lead {lead.email}: {lead.intent} - {lead.score_reason}")
 
         return success_count, error_count
 
+    async def _score_chunks(self, chunks: List[List[Lead]]) -> List:
+        """Score lead chunks concurrently, at most max_concurrency GPT calls in flight"""
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def score(chunk: List[Lead]) -> List[Dict]:
+            async with semaphore:
+                return await self.call_gpt(self.generate_prompt(chunk))
+
+        return await asyncio.gather(*(score(chunk) for chunk in chunks), return_exceptions=True)
+
     def process_batch(self) -> Dict[str, int]:
         """Main processing pipeline"""
         stats = {
@@ -352,27 +391,41 @@ Remember: Return ONLY the JSON array, nothing else."""
             raw_leads = self.fetch_leads()
 
             if not raw_leads:
-                logger.info("No unverified leads found to process")
+                logger.info("No unscored leads found to process")
                 return stats
 
             stats["total_processed"] = len(raw_leads)
 
-            # Generate prompt and call GPT
-            prompt = self.generate_prompt(raw_leads)
-            verified_leads_data = self.call_gpt(prompt)
+            # Generate prompts and call GPT for every chunk concurrently
+            step = self.config.leads_per_request
+            chunks = [raw_leads[i:i + step] for i in range(0, len(raw_leads), step)]
+            results = asyncio.run(self._score_chunks(chunks))
+
+            scores: List[Dict] = []
+            scored_raw_leads: List[Lead] = []
+            failed_count = 0
+
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"GPT scoring failed for a chunk of {len(chunk)} leads: {result}")
+                    failed_count += len(chunk)
+                    continue
+
+                # Validate data count matches
+                if len(result) != len(chunk):
+                    logger.warning(
+                        f"Mismatch: GPT returned {len(result)} leads "
+                        f"but we sent {len(chunk)} leads"
+                    )
 
-            # Validate data count matches
-            if len(verified_leads_data) != len(raw_leads):
-                logger.warning(
-                    f"Mismatch: GPT returned {len(verified_leads_data)} leads "
-                    f"but we sent {len(raw_leads)} leads"
-                )
+                scores.extend(result)
+                scored_raw_leads.extend(chunk)
 
             # Save to database
-            success_count, error_count = self.save_verified_leads(verified_leads_data, raw_leads)
+            success_count, error_count = self.save_scores(scores, scored_raw_leads)
 
             stats["successful"] = success_count
-            stats["failed"] = error_count
+            stats["failed"] = error_count + failed_count
 
         except LeadScoringError as e:
             logger.error(f"Lead scoring error: {e}")
@@ -406,6 +459,13 @@ def parse_arguments() -> argparse.Namespace:
         help='ID of the ICP to use for scoring'
     )
 
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=8,
+        help='Maximum number of GPT requests in flight at once'
+    )
+
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -426,7 +486,9 @@ def main():
     """Main entry point"""
     args = parse_arguments()
 
-    # Update logging level
+    # Configure logging once per process; re-imports and embedding apps keep their handlers
+    if not logging.getLogger().hasHandlers():
+        setup_logging(args.log_level)
     logging.getLogger().setLevel(getattr(logging, args.log_level))
 
     logger.info("=" * 60)
@@ -440,7 +502,8 @@ def main():
         # Create configuration
         config = Config(
             batch_size=args.batch_size,
-            icp_id=args.icp_id
+            icp_id=args.icp_id,
+            max_concurrency=args.max_concurrency
         )
 
         # Initialize scorer
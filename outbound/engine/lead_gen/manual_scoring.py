@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import django
 from time import sleep
@@ -12,12 +13,12 @@ print("🔧 Initializing Django environment...")
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, PROJECT_ROOT)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")
 
 django.setup()
 print("✅ Django ready.\n")
 
-from system.models import Lead
+from outbound.models import Lead
 
 # ------------------------------------------
 # ICP PARAMETERS
@@ -69,6 +70,38 @@ NEGATIVE_KEYWORDS = [
     "crypto", "nft", "token",
 ]
 
+
+def _compile_keywords(keywords):
+    """One regex for a keyword list; the lookahead also reports keywords nested inside longer ones"""
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+    # At each position the regex reports only the longest keyword, so the shorter keywords
+    # it starts with (e.g. 'seo' inside 'seo agency') are added back from this map
+    prefixes = {k: [p for p in keywords if p != k and k.startswith(p)] for k in keywords}
+    return pattern, keywords, prefixes
+
+
+def _keyword_hits(compiled, text):
+    """Keywords found in text, in keyword-list order: same as [k for k in keywords if k in text]"""
+    pattern, keywords, prefixes = compiled
+    found = set()
+    for m in pattern.finditer(text):
+        found.add(m.group(1))
+        found.update(prefixes[m.group(1)])
+    return [k for k in keywords if k in found] if found else []
+
+
+TITLE_RE = _compile_keywords(TARGET_TITLES)[0]
+STRONG = _compile_keywords(STRONG_KEYWORDS)
+MEDIUM = _compile_keywords(MEDIUM_KEYWORDS)
+NEGATIVE = _compile_keywords(NEGATIVE_KEYWORDS)
+
+# Only the columns score_and_classify reads are loaded during reprocessing
+SCORING_FIELDS = (
+    "id", "title", "employees", "website",
+    "seo_description", "company", "keywords", "processing",
+)
+
 # ------------------------------------------
 # Reset stuck leads
 # ------------------------------------------
@@ -79,30 +112,39 @@ def reset_stuck_leads():
 # ------------------------------------------
 # Scoring + Intent Logic
 # ------------------------------------------
+def lead_text_blob(lead):
+    """Lowercased company/keywords/description blob, built once and cached on the lead"""
+    blob = getattr(lead, "_text_blob", None)
+    if blob is None:
+        blob = lead._text_blob = " ".join(filter(None, [
+            lead.company,
+            lead.keywords,
+            lead.seo_description,
+        ])).lower()
+    return blob
+
+
 def score_and_classify(lead):
     # ----- HARD GATES -----
     if not lead.employees or not (2 <= lead.employees <= 25):
         return False, "REJECTED", "Team size outside 2–25"
 
-    if not lead.title or not any(t in lead.title.lower() for t in TARGET_TITLES):
+    if not lead.title or not TITLE_RE.search(lead.title.lower()):
         return False, "REJECTED", "Title not revenue-owning"
 
     if not lead.website and not lead.seo_description:
         return False, "REJECTED", "No website or description"
 
-    text = " ".join(filter(None, [
-        lead.company,
-        lead.keywords,
-        lead.seo_description,
-    ])).lower()
+    # Only leads that pass the cheap gates pay for building the text blob
+    text = lead_text_blob(lead)
 
-    for bad in NEGATIVE_KEYWORDS:
-        if bad in text:
-            return False, "REJECTED", f"Negative signal: {bad}"
+    bad = _keyword_hits(NEGATIVE, text)
+    if bad:
+        return False, "REJECTED", f"Negative signal: {bad[0]}"
 
     # ----- POSITIVE SIGNALS -----
-    strong_hits = [kw for kw in STRONG_KEYWORDS if kw in text]
-    medium_hits = [kw for kw in MEDIUM_KEYWORDS if kw in text]
+    strong_hits = _keyword_hits(STRONG, text)
+    medium_hits = _keyword_hits(MEDIUM, text)
 
     if strong_hits:
         intent = "HIGH"
@@ -119,7 +161,7 @@ def score_and_classify(lead):
 # ------------------------------------------
 # Main Reprocessing Loop
 # ------------------------------------------
-def main(batch_size=100, sleep_sec=2):
+def main(batch_size=500, sleep_sec=0):
     print("🚀 Starting FULL ICP reprocessing with intent segmentation...\n")
     reset_stuck_leads()
 
@@ -128,55 +170,52 @@ def main(batch_size=100, sleep_sec=2):
 
     stats = defaultdict(int)
 
-    last_id = 0
     print(f"📊 Total leads in database: {total_leads}\n")
 
-    while True:
-        leads = list(
-            Lead.objects
-            .filter(id__gt=last_id)
-            .order_by("id")[:batch_size]
-        )
-
-        if not leads:
-            break
-
-        for lead in leads:
-            last_id = lead.id
-
-            try:
-                with transaction.atomic():
-                    locked = Lead.objects.select_for_update().get(id=lead.id)
-                    if locked.processing:
-                        continue
-                    locked.processing = True
-                    locked.save(update_fields=["processing"])
-
-                icp, intent, reason = score_and_classify(lead)
-
-                with transaction.atomic():
-                    update = Lead.objects.select_for_update().get(id=lead.id)
-                    update.score = icp
-                    update.intent = intent
-                    update.score_reason = reason
-                    update.processing = False
-                    update.save(
-                        update_fields=["score", "intent", "score_reason", "processing"]
-                    )
-
-                processed += 1
-                stats[intent] += 1
-
-                print(
-                    f"💾 [{processed}/{total_leads}] "
-                    f"Lead {lead.id} | ICP={icp} | Intent={intent}"
-                )
-
-            except Exception as e:
-                print(f"❌ Error on lead {lead.id}: {e}")
-                Lead.objects.filter(id=lead.id).update(processing=False)
-
-        sleep(sleep_sec)
+    leads = (
+        Lead.objects
+        .only(*SCORING_FIELDS)
+        .order_by("id")
+        .iterator(chunk_size=2000)
+    )
+    to_update = []
+
+    def flush():
+        nonlocal processed
+        with transaction.atomic():
+            Lead.objects.bulk_update(
+                to_update,
+                ["score", "intent", "score_reason", "processing"],
+                batch_size=batch_size,
+            )
+        processed += len(to_update)
+        print(f"💾 [{processed}/{total_leads}] Batch saved up to lead {to_update[-1].id}")
+        to_update.clear()
+
+    for lead in leads:
+        if lead.processing:
+            continue
+
+        try:
+            icp, intent, reason = score_and_classify(lead)
+        except Exception as e:
+            print(f"❌ Error on lead {lead.id}: {e}")
+            continue
+
+        lead.score = icp
+        lead.intent = intent
+        lead.score_reason = reason
+        lead.processing = False
+        to_update.append(lead)
+        stats[intent] += 1
+
+        if len(to_update) >= batch_size:
+            flush()
+            if sleep_sec:
+                sleep(sleep_sec)
+
+    if to_update:
+        flush()
 
     # ------------------------------------------
     # Final Report
@@ -198,4 +237,4 @@ def main(batch_size=100, sleep_sec=2):
 # Entry
 # ------------------------------------------
 if __name__ == "__main__":
-    main(batch_size=100, sleep_sec=2)
+    main(batch_size=500, sleep_sec=0)
@@ -3,6 +3,10 @@ import sys
 import django
 import re
 import json
+import asyncio
+import logging
+import argparse
+from itertools import islice
 from time import sleep
 from django.db import transaction
 
@@ -13,21 +17,27 @@ print("🔧 Setting up Django environment...")
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, PROJECT_ROOT)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")
 
 django.setup()
 print("✅ Django setup complete.")
 
-from system.models import Lead  # Adjust if your app name differs
-from openai import OpenAI  # Using OpenAI / Genesis API
+from outbound.models import Lead
+from openai import OpenAI, AsyncOpenAI  # Using OpenAI / Genesis API
+from outbound.engine.utils import openai_http_client, openai_async_http_client, setup_queue_logging
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=openai_http_client())
+
+SCORING_MODEL = "gpt-4.1"
+MAX_CONCURRENT_SCORING = 20
 
 # ------------------------------------------
 # ICP Prompt
 # ------------------------------------------
 ICP_PROMPT = """
-You are an expert ICP evaluator for small marketing/growth/SEO agencies. Your task is to evaluate leads and decide if they are PERFECT ICP (~95% confidence) based on:
+You are an expert ICP evaluator for small marketing/growth/SEO agencies. Your task is to evaluate a lead and decide if it is a PERFECT ICP (~95% confidence) based on:
 
 - Small agencies (1–20 employees)
 - Solo/small teams
@@ -41,7 +51,7 @@ Rules:
 3. Reject large teams, VC-funded, competitors, non-businesses, hobbyists, influencers, abstract services.
 4. No hallucinations. Base judgement strictly on provided data.
 
-Respond ONLY with a JSON array. Each object must contain:
+Respond ONLY with a JSON object containing:
 {
     "icp": true|false,
     "reason": "Brief evidence from keywords, description, or employees (max 20 words)"
@@ -49,6 +59,13 @@ Respond ONLY with a JSON array. Each object must contain:
 Do NOT include code blocks, markdown, explanations, or ellipses.
 """
 
+# Compiled once: code fences around GPT output, and the JSON object fallback
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n?|\n?```$")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Columns the scoring prompt actually reads
+SCORING_FIELDS = ("id", "first_name", "last_name", "title", "keywords", "seo_description", "employees")
+
 # ------------------------------------------
 # Utility to split list into batches
 # ------------------------------------------
@@ -56,107 +73,242 @@ def batch_iterable(iterable, size):
     for i in range(0, len(iterable), size):
         yield iterable[i:i+size]
 
+
+def next_batch(queryset, batch_size):
+    """Stream the first batch_size rows of queryset (ordered by id) without caching the QuerySet"""
+    return list(islice(queryset.order_by("id").iterator(chunk_size=batch_size), batch_size))
+
 # ------------------------------------------
-# Function to score a batch of leads
+# Lead payload + GPT output parsing
 # ------------------------------------------
-def score_batch(leads):
-    print(f"\n🔥 Scoring batch of {len(leads)} leads")
-
-    combined_input = ICP_PROMPT + "\n\nLEADS:\n"
-    for i, lead in enumerate(leads):
-        lead_info = {
-            "name": f"{lead.first_name} {lead.last_name}",
-            "title": lead.title,
-            "keywords": lead.keywords,
-            "seo_description": lead.seo_description,
-            "employees": lead.employees
-        }
-        combined_input += f"\nLead {i+1}: {json.dumps(lead_info)}"
-
-    print("📤 Sending batch to GPT for scoring...")
+def lead_payload(lead):
+    return {
+        "name": f"{lead.first_name} {lead.last_name}",
+        "title": lead.title,
+        "keywords": lead.keywords,
+        "seo_description": lead.seo_description,
+        "employees": lead.employees
+    }
 
+
+def parse_score(output):
+    """Parse GPT output into an {"icp", "reason"} dict (None if unparseable)"""
+    # Clean GPT output
+    output_clean = _FENCE_RE.sub("", output.strip()).strip()
+    logger.debug("Cleaned GPT output: %.500s", output_clean)
+
+    # Try direct JSON load
     try:
-        response = client.responses.create(
-            model="gpt-4.1",
-            input=combined_input,
-            max_output_tokens=600
-        )
-        output = response.output_text
-        print("RAW GPT OUTPUT (first 1000 chars):\n", output[:1000], "...")
-
-        # Clean GPT output
-        output_clean = output.strip()
-        if output_clean.startswith("```"):
-            output_clean = "\n".join(output_clean.split("\n")[1:])
-        if output_clean.endswith("```"):
-            output_clean = "\n".join(output_clean.split("\n")[:-1])
-        output_clean = output_clean.strip()
-        print("📌 Cleaned GPT output (first 500 chars):\n", output_clean[:500], "...")
-
-        # Try direct JSON load
+        result = json.loads(output_clean)
+    except Exception as e:
+        logger.debug("Direct JSON parse failed: %s", e)
+        match = _JSON_OBJECT_RE.search(output_clean)
+        if not match:
+            logger.warning("No JSON object found in GPT output, skipping lead")
+            return None
+        result = json.loads(match.group(0))
+
+    if isinstance(result, list):
+        result = result[0] if result else None
+    return result if isinstance(result, dict) else None
+
+# ------------------------------------------
+# Function to score a batch of leads
+# ------------------------------------------
+async def score_one(aclient, lead, semaphore):
+    """Score a single lead; one bad lead can't poison the rest of the batch"""
+    async with semaphore:
         try:
-            results = json.loads(output_clean)
-            print("✅ JSON parsed successfully.")
-            return results
+            response = await aclient.chat.completions.create(
+                model=SCORING_MODEL,
+                messages=[
+                    {"role": "system", "content": ICP_PROMPT},
+                    {"role": "user", "content": json.dumps(lead_payload(lead))},
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=100
+            )
+            return parse_score(response.choices[0].message.content)
+
         except Exception as e:
-            print("⚠️ Direct JSON parse failed:", e)
-            match = re.search(r'\[.*\]', output_clean, re.DOTALL)
-            if match:
-                results = json.loads(match.group(0))
-                print("✅ JSON parsed after fallback.")
-                return results
-            else:
-                print("❌ No JSON array found. Skipping batch.")
-                return []
+            logger.error("GPT API call failed for lead %s: %s", lead.id, e)
+            return None
 
-    except Exception as e:
-        print("❌ GPT API call failed:", e)
-        return []
+
+async def score_batch(leads):
+    logger.debug("Scoring batch of %d leads", len(leads))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCORING)
+    # Each asyncio.run gets its own loop, and a pooled httpx connection can't outlive the
+    # loop it was opened on, so the async client lives and dies with the batch
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=openai_async_http_client()) as aclient:
+        return await asyncio.gather(*(score_one(aclient, lead, semaphore) for lead in leads))
+
+# ------------------------------------------
+# OpenAI Batch API (one request per lead, ~50% cheaper, async server-side)
+# ------------------------------------------
+BATCH_DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def submit_batch(leads):
+    """Upload one chat-completion request per lead as a Batch API job; returns the batch id"""
+    lines = []
+    for lead in leads:
+        lines.append(json.dumps({
+            "custom_id": str(lead.id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": SCORING_MODEL,
+                "messages": [
+                    {"role": "system", "content": ICP_PROMPT},
+                    {"role": "user", "content": json.dumps(lead_payload(lead))},
+                ],
+                "response_format": {"type": "json_object"},
+                "max_tokens": 100,
+            },
+        }))
+
+    batch_file = client.files.create(
+        file=("icp_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    # Remember the job on the leads so a restart resumes it instead of re-submitting
+    Lead.objects.filter(pk__in=[lead.pk for lead in leads]).update(
+        processing=True, scoring_batch_id=batch.id
+    )
+    print(f"📤 Submitted batch {batch.id} with {len(leads)} leads")
+    return batch.id
+
+
+def collect_batch(batch_id, poll_sec=60):
+    """Wait for a Batch API job to finish and write its scores back to the leads"""
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in BATCH_DONE_STATUSES:
+        print(f"⏳ Batch {batch_id} is {batch.status}, checking again in {poll_sec}s...")
+        sleep(poll_sec)
+        batch = client.batches.retrieve(batch_id)
+
+    leads = {lead.id: lead for lead in Lead.objects.filter(scoring_batch_id=batch_id)}
+    scored = []
+
+    if batch.status == "completed" and batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            lead = leads.get(int(item["custom_id"]))
+            response = item.get("response") or {}
+            if lead is None or response.get("status_code") != 200:
+                continue
+
+            res = parse_score(response["body"]["choices"][0]["message"]["content"])
+            if not res:
+                continue
+
+            lead.score = res.get("icp", False)
+            lead.score_reason = res.get("reason", "")
+            lead.processing = False
+            lead.scoring_batch_id = None
+            scored.append(lead)
+    else:
+        print(f"❌ Batch {batch_id} ended with status {batch.status}")
+
+    with transaction.atomic():
+        Lead.objects.bulk_update(scored, ["score", "score_reason", "processing", "scoring_batch_id"], batch_size=500)
+        # Anything the job didn't score goes back into the queue
+        Lead.objects.filter(scoring_batch_id=batch_id).update(processing=False, scoring_batch_id=None)
+
+    print(f"✅ Batch {batch_id}: {len(scored)}/{len(leads)} leads scored")
+
+
+def main_batch(batch_size=1000, poll_sec=60):
+    print("🚀 Starting ICP scoring via OpenAI Batch API...")
+
+    # Resume jobs submitted by an earlier run first
+    pending = (
+        Lead.objects.filter(scoring_batch_id__isnull=False)
+        .values_list("scoring_batch_id", flat=True).distinct()
+    )
+    for batch_id in list(pending):
+        print(f"🔁 Resuming batch {batch_id}")
+        collect_batch(batch_id, poll_sec)
+
+    while True:
+        # score_reason marks leads already judged (incl. non-ICP), so they aren't resubmitted
+        leads = next_batch(
+            Lead.objects.filter(score=False, processing=False, score_reason__isnull=True)
+            .only(*SCORING_FIELDS),
+            batch_size
+        )
+        if not leads:
+            print("🎉 No more leads to score. Exiting.")
+            break
+
+        collect_batch(submit_batch(leads), poll_sec)
 
 # ------------------------------------------
 # Main scoring loop
 # ------------------------------------------
+def claim_batch(batch_size):
+    """Mark the next unscored leads processing=True and return them; parallel workers skip them"""
+    # Short transaction: the row locks only cover the claim, not the GPT round trip
+    with transaction.atomic():
+        # score_reason marks leads already judged (incl. non-ICP), so they aren't rescored
+        leads = next_batch(
+            Lead.objects.select_for_update(skip_locked=True)
+            .filter(score=False, processing=False, score_reason__isnull=True).only(*SCORING_FIELDS),
+            batch_size
+        )
+        Lead.objects.filter(pk__in=[lead.pk for lead in leads]).update(processing=True)
+    return leads
+
+
 def main(batch_size=10, sleep_sec=2):
     print("🚀 Starting ICP scoring process...")
 
     while True:
-        # Use processing flag to avoid re-fetching same leads
-        leads = list(Lead.objects.filter(score=False, processing=False)[:batch_size])
+        leads = claim_batch(batch_size)
         if not leads:
             print("🎉 No more leads to score. Exiting.")
             break
 
-        print(f"\n📦 Fetching {len(leads)} leads for scoring...")
+        logger.debug("Fetched %d leads for scoring", len(leads))
 
-        # Mark leads as processing
-        with transaction.atomic():
-            for lead in leads:
-                lead.processing = True
-                lead.save()
-
-        results = score_batch(leads)
-
-        if not results or len(results) != len(leads):
-            print("⚠️ GPT results mismatch. Resetting processing flag and skipping batch.")
-            with transaction.atomic():
-                for lead in leads:
-                    lead.processing = False
-                    lead.save()
-            sleep(sleep_sec)
-            continue
+        results = asyncio.run(score_batch(leads))
 
         # Update DB with scoring
+        scored = []
+        for lead, res in zip(leads, results):
+            if not res:
+                continue
+            lead.score = res.get("icp", False)
+            lead.score_reason = res.get("reason", "")
+            lead.processing = False
+            scored.append(lead)
+            logger.debug("%s %s | ICP=%s | Reason: %s", lead.first_name, lead.last_name, lead.score, lead.score_reason)
+
         with transaction.atomic():
-            print("💾 Updating leads in DB with scoring results...")
-            for lead, res in zip(leads, results):
-                lead.score = res.get("icp", False)
-                lead.score_reason = res.get("reason", "")
-                lead.processing = False
-                lead.save()
-                print(f"   ➤ {lead.first_name} {lead.last_name} | ICP={lead.score} | Reason: {lead.score_reason}")
-
-        print(f"✅ Batch of {len(leads)} leads scored and updated.")
+            Lead.objects.bulk_update(scored, ["score", "score_reason", "processing"], batch_size=500)
+            # Leads GPT failed on are released for the next pass
+            Lead.objects.filter(pk__in=[lead.pk for lead in leads], processing=True).update(processing=False)
+
+        print(f"✅ {len(scored)}/{len(leads)} leads scored and updated.")
         sleep(sleep_sec)
 
 if __name__ == "__main__":
-    main(batch_size=20, sleep_sec=3)
+    parser = argparse.ArgumentParser(description="Score leads against the ICP with GPT")
+    parser.add_argument("--batch-api", action="store_true", help="Use the OpenAI Batch API (cheaper, not real-time)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log per-lead scoring details")
+    args = parser.parse_args()
+    setup_queue_logging(logging.DEBUG if args.verbose else logging.INFO)
+
+    if args.batch_api:
+        main_batch(batch_size=1000, poll_sec=60)
+    else:
+        main(batch_size=20, sleep_sec=3)
@@ -28,7 +28,7 @@ from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Django imports
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.utils import timezone
@@ -576,6 +576,9 @@ def clean_emails(
         batch_num = i // batch_size + 1
         logger.info(f"Processing batch {batch_num} ({len(batch)} leads)")
 
+        # Collect changes and write them once per batch
+        changed = []
+
         # Process batch
         for lead in batch:
             try:
@@ -588,23 +591,19 @@ def clean_emails(
                     if not dry_run:
                         lead.email = None
                         lead.email_verified = False
-                        lead.save(update_fields=['email', 'email_verified'])
+                        changed.append(lead)
                         validator.stats.cleaned += 1
                     continue
 
                 # EMAIL IS VALID — optionally corrected
-                updated_fields = []
-
                 if result.corrected_email:
                     lead.email = result.corrected_email
-                    updated_fields.append('email')
 
                 # Mark email as verified
                 lead.email_verified = True
-                updated_fields.append('email_verified')
 
                 if not dry_run:
-                    lead.save(update_fields=updated_fields)
+                    changed.append(lead)
 
                 processed += 1
 
@@ -614,12 +613,27 @@ def clean_emails(
             except Exception as e:
                 logger.error(f"Error processing lead ID {lead.id}: {e}")
 
+        if changed:
+            save_lead_emails(changed)
+
 
     logger.info(f"Email cleaning completed. Processed {processed} leads.")
     validator.print_stats()
 
     return validator.stats
 
+def save_lead_emails(leads: List[Lead]) -> None:
+    """Bulk-write email/email_verified; falls back to per-row saves if a corrected email collides"""
+    try:
+        with transaction.atomic():
+            Lead.objects.bulk_update(leads, ['email', 'email_verified'], batch_size=500)
+    except IntegrityError:
+        for lead in leads:
+            try:
+                lead.save(update_fields=['email', 'email_verified'])
+            except IntegrityError as e:
+                logger.error(f"Error saving lead ID {lead.id}: {e}")
+
 # ✅ Main callable function (safe for Django / LangGraph use)
 def validate_emails_tool(
     dry_run=False,
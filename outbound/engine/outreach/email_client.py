@@ -1,46 +1,140 @@
 import smtplib
 import os
+import time
+import atexit
 import itertools
+import threading
 from email.mime.text import MIMEText
 from email.utils import formataddr
 from django.conf import settings
 
 
 class SMTPManager:
+    # Transient SMTP replies worth one retry on a fresh connection
+    RETRY_CODES = (421, 450, 554)
+    # Connections idle longer than this get a NOOP before reuse
+    IDLE_CHECK_SECONDS = 30
+
     def __init__(self):
         print("Initializing SMTP rotation manager…")
         self.accounts = settings.EMAIL_ACCOUNTS
         self.pool = itertools.cycle(self.accounts)
+        self.pool_lock = threading.Lock()
+
+        # One persistent, logged-in connection per account; smtplib isn't thread-safe
+        self.connections = {}
+        self.last_used = {}
+        self.locks = {account["EMAIL_HOST_USER"]: threading.Lock() for account in self.accounts}
+
+        # Headers that never change between sends are rendered once
+        self.from_headers = {
+            account["EMAIL_HOST_USER"]: formataddr((account["DISPLAY_NAME"], account["EMAIL_HOST_USER"]))
+            for account in self.accounts
+        }
+        self.reply_to = os.getenv("REPLY_INBOX")
         print(f"Loaded {len(self.accounts)} SMTP accounts")
 
-    def send_email(self, subject, body, to_email):
-        account = next(self.pool)
-        print(f"Using SMTP account: {account['EMAIL_HOST_USER']}")
+    def _connect(self, account):
+        print(f"Connecting to SMTP server {account['EMAIL_HOST']}...")
+        server = smtplib.SMTP(account["EMAIL_HOST"], account["EMAIL_PORT"], timeout=30)
+        server.starttls()
+        server.login(account["EMAIL_HOST_USER"], account["EMAIL_HOST_PASSWORD"])
+        return server
+
+    def _drop(self, user):
+        server = self.connections.pop(user, None)
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _get_conn(self, account):
+        """Return the account's live connection, reconnecting if it went stale"""
+        user = account["EMAIL_HOST_USER"]
+        server = self.connections.get(user)
+
+        if server is not None and time.monotonic() - self.last_used.get(user, 0) > self.IDLE_CHECK_SECONDS:
+            try:
+                if server.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP health check failed")
+            except (smtplib.SMTPException, OSError):
+                self._drop(user)
+                server = None
 
-        REPLY_INBOX = os.getenv("REPLY_INBOX")
+        if server is None:
+            server = self.connections[user] = self._connect(account)
+        return server
+
+    def send_email(self, subject, body, to_email, account=None):
+        """Send through `account`, or the next account in the rotation when not given"""
+        if account is None:
+            with self.pool_lock:
+                account = next(self.pool)
+        user = account["EMAIL_HOST_USER"]
 
         # Construct MIME message
         msg = MIMEText(body, "plain", "utf-8")
         msg["Subject"] = subject
-        msg["From"] = formataddr((account["DISPLAY_NAME"], account["EMAIL_HOST_USER"]))
+        msg["From"] = self.from_headers[user]
         msg["To"] = to_email
-        if REPLY_INBOX:
-            msg["Reply-To"] = REPLY_INBOX
+        if self.reply_to:
+            msg["Reply-To"] = self.reply_to
 
-        try:
-            print("Connecting to SMTP server...")
-            with smtplib.SMTP(account["EMAIL_HOST"], account["EMAIL_PORT"]) as server:
-                server.starttls()
-                server.login(account["EMAIL_HOST_USER"], account["EMAIL_HOST_PASSWORD"])
-                # Use send_message to preserve From + Reply-To
-                server.send_message(msg)
-            print(f"Email sent successfully to {to_email}")
-            return account["EMAIL_HOST_USER"], True
+        with self.locks[user]:
+            for attempt in range(2):
+                try:
+                    # Use send_message to preserve From + Reply-To
+                    self._get_conn(account).send_message(msg)
+                    self.last_used[user] = time.monotonic()
+                    print(f"Email sent successfully to {to_email}")
+                    return user, True
+
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, ConnectionError) as e:
+                    self._drop(user)
+                    retryable = not isinstance(e, smtplib.SMTPResponseException) or e.smtp_code in self.RETRY_CODES
+                    if attempt == 0 and retryable:
+                        print(f"SMTP connection issue ({e}), reconnecting and retrying...")
+                        time.sleep(2 ** attempt)
+                        continue
+                    print("SMTP ERROR:", e)
+                    return user, False
+
+                except Exception as e:
+                    self._drop(user)
+                    print("SMTP ERROR:", e)
+                    return user, False
+
+    def send_many(self, messages, account):
+        """Send (subject, body, to_email) triples over one held connection; returns the success count"""
+        user = account["EMAIL_HOST_USER"]
+        sent = 0
+        with self.locks[user]:
+            for subject, body, to_email in messages:
+                msg = MIMEText(body, "plain", "utf-8")
+                msg["Subject"] = subject
+                msg["From"] = self.from_headers[user]
+                msg["To"] = to_email
+                if self.reply_to:
+                    msg["Reply-To"] = self.reply_to
+
+                try:
+                    self._get_conn(account).send_message(msg)
+                    self.last_used[user] = time.monotonic()
+                    sent += 1
+                except (smtplib.SMTPException, OSError) as e:
+                    # Next message reconnects through _get_conn
+                    self._drop(user)
+                    print(f"SMTP ERROR ({to_email}):", e)
+        return sent
 
-        except Exception as e:
-            print("SMTP ERROR:", e)
-            return account["EMAIL_HOST_USER"], False
+    def close_all(self):
+        for user, lock in self.locks.items():
+            with lock:
+                self._drop(user)
 
 
 # Initialize SMTP client
 smtp_client = SMTPManager()
+atexit.register(smtp_client.close_all)
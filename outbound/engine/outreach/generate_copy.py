@@ -2,9 +2,13 @@ import os
 import sys
 import django
 import random
-import time
 import json
-from typing import Tuple, Optional
+import time
+import asyncio
+import logging
+import argparse
+from itertools import islice
+from typing import List, Tuple, Optional
 
 # ------------------------------------------
 # Django Setup
@@ -14,16 +18,25 @@ sys.path.insert(0, PROJECT_ROOT)
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 django.setup()
 
+from django.db import transaction
 from system.models import Lead, EmailTemplate, LeadEmailCopy
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
+from outbound.engine.utils import LLMCache, openai_async_http_client, setup_queue_logging
+
+logger = logging.getLogger(__name__)
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+EMAIL_MODEL = "gpt-4o-mini"
+EMAIL_TEMPERATURE = 0.85
+
+# Only deterministic (temperature 0) generations are cached; sampled copy should vary per run
+llm_cache = LLMCache(namespace="email_copy", ttl=86400)
 
 # ------------------------------------------
 # Prompt Builder (JSON output)
 # ------------------------------------------
-def build_email_prompt(lead, template_content: str) -> str:
-    return f"""
+# Static instructions go first as the system message so every call shares the same
+# prefix (OpenAI prompt caching); only template guidance and lead info vary.
+EMAIL_SYSTEM_PROMPT = """
 You are an expert B2B email copywriter.
 
 Rules:
@@ -31,12 +44,19 @@ Rules:
 - Do not include greetings or sign-offs.
 - Do not repeat phrases from template.
 - Be helpful, curious, and human.
-- Output JSON ONLY. Do NOT add any text outside the JSON. Keys must be: "subject_line", "body" 
-{{
+
+SUBJECT LINE GUIDANCE: - Make it catchy, intriguing, or curiosity-driven. - Include something personal about the lead or their company if possible. - Use different approaches each time: questions, numbers, insights, or bold statements. - Do NOT start every subject with 'Quick thought' or 'Quick check-in'. - Aim for 3-6 words maximum.
+
+Output JSON ONLY. Do NOT add any text outside the JSON. Keys must be: "subject_line", "body"
+{
   "subject_line": " ",
   "body": " "
-}}
+}
+"""
+
 
+def build_email_prompt(lead, template_content: str) -> str:
+    return f"""
 Template guidance (adapt per lead):
 {template_content}
 
@@ -46,101 +66,157 @@ Lead info:
 - Website: {lead.website}
 - Title: {lead.title}
 - Description: {lead.seo_description}
-SUBJECT LINE GUIDANCE: - Make it catchy, intriguing, or curiosity-driven. - Include something personal about the lead or their company if possible. - Use different approaches each time: questions, numbers, insights, or bold statements. - Do NOT start every subject with 'Quick thought' or 'Quick check-in'. - Aim for 3-6 words maximum.
-Output JSON ONLY with keys: subject, body. Example:
-{{
-  "subject_line": " ",
-  "body": " "
-}}
 """
 
 # ------------------------------------------
-# GPT JSON Parser
+# Structured Output Schema
 # ------------------------------------------
-def parse_email_response(raw_output: str) -> Tuple[Optional[str], Optional[str]]:
-    try:
-        data = json.loads(raw_output)
-        subject = data.get("subject_line", "").strip()
-        body = data.get("body", "").strip()
-        if not subject or not body:
-            return None, None
-        return subject, body
-    except Exception as e:
-        print(f"❌ JSON parse error: {e}")
-        return None, None
+# Strict JSON schema: the API guarantees exactly these keys, so no parsing fallback is needed
+EMAIL_SCHEMA = {
+    "name": "email",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "subject_line": {"type": "string"},
+            "body": {"type": "string"},
+        },
+        "required": ["subject_line", "body"],
+        "additionalProperties": False,
+    },
+    "strict": True,
+}
 
 # ------------------------------------------
 # GPT Email Generator
 # ------------------------------------------
-def generate_personalized_email(
+async def generate_personalized_email(
+    client: AsyncOpenAI,
     lead,
     template_content: str,
-    max_retries: int = 3
+    max_retries: int = 3,
+    deterministic: bool = False
 ) -> Tuple[Optional[str], Optional[str]]:
 
     prompt = build_email_prompt(lead, template_content)
+    temperature = 0 if deterministic else EMAIL_TEMPERATURE
+
+    cache_key = llm_cache.key(EMAIL_MODEL, temperature, prompt) if deterministic else None
+    if cache_key:
+        cached = await llm_cache.aget(cache_key)
+        if cached:
+            logger.debug("Cached email for %s %s", lead.first_name, lead.last_name)
+            return tuple(cached)
 
     for attempt in range(1, max_retries + 1):
         try:
-            print(f"📤 GPT → {lead.first_name} {lead.last_name} (attempt {attempt})")
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.85,
-                max_tokens=250
+            logger.debug("GPT -> %s %s (attempt %d)", lead.first_name, lead.last_name, attempt)
+            response = await client.chat.completions.create(
+                model=EMAIL_MODEL,
+                messages=[
+                    {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=temperature,
+                max_tokens=250,
+                response_format={"type": "json_schema", "json_schema": EMAIL_SCHEMA}
             )
-            raw = response.choices[0].message.content
-            subject, body = parse_email_response(raw)
+            data = json.loads(response.choices[0].message.content)
+            subject, body = data["subject_line"].strip(), data["body"].strip()
             if subject and body:
-                print("✅ Email generated")
+                logger.debug("Email generated for lead %s", lead.id)
+                if cache_key:
+                    await llm_cache.aset(cache_key, (subject, body))
                 return subject, body
-            print("⚠️ Empty subject/body — retrying")
+            logger.warning("Empty subject/body for lead %s, retrying", lead.id)
+        except RateLimitError as e:
+            logger.warning("Rate limited: %s", e)
+            await asyncio.sleep(2 ** attempt)
         except Exception as e:
-            print(f"❌ GPT API error: {e}")
-            time.sleep(2 ** attempt)
+            logger.error("GPT API error: %s", e)
+            await asyncio.sleep(2 ** attempt)
     return None, None
 
+
+async def generate_emails(jobs, max_concurrent: int = 10, deterministic: bool = False):
+    """Run generate_personalized_email for (lead, template) jobs, max_concurrent at a time"""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run(client, lead, template):
+        async with semaphore:
+            return await generate_personalized_email(client, lead, template.prompt, deterministic=deterministic)
+
+    # Each asyncio.run gets its own loop, and a pooled httpx connection can't outlive the
+    # loop it was opened on, so the async client lives and dies with the run
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=openai_async_http_client()) as client:
+        return await asyncio.gather(*(run(client, lead, template) for lead, template in jobs))
+
 # ------------------------------------------
 # Template Selector
 # ------------------------------------------
+# Templates change rarely; reload them at most every TEMPLATE_CACHE_TTL seconds
+TEMPLATE_CACHE_TTL = 300
+_template_cache = {"ts": 0.0, "data": []}
+
+
+def get_templates() -> List[EmailTemplate]:
+    now = time.monotonic()
+    if now - _template_cache["ts"] > TEMPLATE_CACHE_TTL:
+        _template_cache["data"] = list(EmailTemplate.objects.all())
+        _template_cache["ts"] = now
+    return _template_cache["data"]
+
+
 def get_random_template() -> Optional[EmailTemplate]:
-    templates = list(EmailTemplate.objects.all())
+    templates = get_templates()
     if not templates:
         print("❌ No templates found in DB")
         return None
     template = random.choice(templates)
-    print(f"🎨 Using template: {template.name}")
+    logger.debug("Using template: %s", template.name)
     return template
 
 # ------------------------------------------
 # Main Email Generation
 # ------------------------------------------
-def main(batch_size: int = 20):
+def main(batch_size: int = 20, max_concurrent: int = 10, deterministic: bool = False):
     print("\n====================================================")
     print("🚀 HIGH-INTENT EMAIL GENERATION (JSON OUTPUT)")
     print("====================================================\n")
 
-    leads = list(
+    leads = list(islice(
         Lead.objects.filter(
             score=True,
             intent="MEDIUM",
             email_verified=True,
             ready_to_send=False
-        ).order_by("id")[:batch_size]
-    )
+        ).only(
+            "id", "first_name", "last_name", "company",
+            "website", "title", "seo_description", "ready_to_send"
+        ).order_by("id").iterator(chunk_size=batch_size),
+        batch_size
+    ))
     if not leads:
         print("🎉 No HIGH-intent leads available.")
         return
 
+    # One query for every lead in the batch instead of an exists() per lead
+    existing = set(
+        LeadEmailCopy.objects.filter(lead_id__in=[lead.id for lead in leads])
+        .values_list("lead_id", flat=True)
+    )
+
     generated, skipped, failed = 0, 0, 0
+    jobs = []
+    to_mark = []
 
+    # DB work stays synchronous; only the GPT calls run concurrently
     for lead in leads:
-        print(f"→ Processing lead {lead.id} | {lead.company}")
+        logger.debug("Processing lead %s | %s", lead.id, lead.company)
 
-        if LeadEmailCopy.objects.filter(lead=lead).exists():
-            print("⚠️ Email already exists — skipping")
+        if lead.id in existing:
+            logger.debug("Email already exists for lead %s, skipping", lead.id)
             lead.ready_to_send = True
-            lead.save(update_fields=["ready_to_send"])
+            to_mark.append(lead)
             skipped += 1
             continue
 
@@ -149,23 +225,32 @@ def main(batch_size: int = 20):
             failed += 1
             continue
 
-        subject, body = generate_personalized_email(lead, template.prompt)
+        jobs.append((lead, template))
+
+    results = asyncio.run(generate_emails(jobs, max_concurrent, deterministic))
+
+    copies = []
+    for (lead, template), (subject, body) in zip(jobs, results):
         if not subject or not body:
-            print("❌ Generation failed")
+            logger.warning("Generation failed for lead %s", lead.id)
             failed += 1
             continue
 
-        LeadEmailCopy.objects.create(
+        copies.append(LeadEmailCopy(
             lead=lead,
             template_name=template.name,
             subject=subject,
             body=body,
             ready_to_send=True
-        )
+        ))
         lead.ready_to_send = True
-        lead.save(update_fields=["ready_to_send"])
+        to_mark.append(lead)
         generated += 1
-        print("💾 Email saved\n")
+
+    with transaction.atomic():
+        LeadEmailCopy.objects.bulk_create(copies)
+        Lead.objects.bulk_update(to_mark, ["ready_to_send"])
+    print(f"💾 {len(copies)} emails saved\n")
 
     print("\n====================================================")
     print(f"✅ Generated: {generated} | ⚠️ Skipped: {skipped} | ❌ Failed: {failed}")
@@ -173,4 +258,13 @@ def main(batch_size: int = 20):
 
 
 if __name__ == "__main__":
-    main(batch_size=20)
+    parser = argparse.ArgumentParser(description="Generate personalized outreach emails")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log per-lead generation details")
+    parser.add_argument(
+        "--deterministic", action="store_true",
+        help="Generate at temperature 0 and reuse cached copy for identical prompts (e.g. re-runs after a failed save)"
+    )
+    args = parser.parse_args()
+    setup_queue_logging(logging.DEBUG if args.verbose else logging.INFO)
+
+    main(batch_size=20, deterministic=args.deterministic)
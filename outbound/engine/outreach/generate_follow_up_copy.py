@@ -2,11 +2,17 @@ import os
 import sys
 import django
 import random
-import time
 import json
-from typing import Tuple, Optional, List
+import asyncio
+from celery import group, shared_task
+import logging
+import itertools
+from functools import lru_cache
+from typing import Tuple, Optional, List, Dict, Iterator
 from datetime import timedelta
 from django.utils import timezone
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Prefetch
 
 # -------------------------
@@ -18,9 +24,12 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 django.setup()
 
 from system.models import Lead, LeadEmailCopy, FollowUp, EmailTemplate
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from outbound.engine.utils import openai_http_client, openai_async_http_client, setup_queue_logging
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+batch_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=openai_http_client())
 
 # -------------------------
 # Configuration
@@ -30,17 +39,40 @@ MAX_GPT_RETRIES = 3
 BATCH_SIZE = 50
 GPT_MODEL = "gpt-4o-mini"
 GPT_TEMPERATURE = 0.85
-GPT_MAX_TOKENS = 300
+GPT_MAX_TOKENS = 300    # per lead
+GPT_CHUNK_SIZE = 20     # leads per GPT call
+MAX_CONCURRENCY = 8     # GPT calls in flight
+TEMPLATE_CACHE_KEY = "followup:templates:v1"
+TEMPLATE_CACHE_TTL = 300  # seconds
+BATCH_JOB_TAG = "followup_generation"  # metadata tag on our OpenAI Batch API jobs
+BATCH_DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# -------------------------
+# Helper: Email Templates (shared across runs and workers via the cache)
+# -------------------------
+def get_templates() -> List[EmailTemplate]:
+    return cache.get_or_set(TEMPLATE_CACHE_KEY, lambda: list(EmailTemplate.objects.all()), TEMPLATE_CACHE_TTL)
+
+
+def template_cycle(templates: List[EmailTemplate]) -> Iterator[Tuple[int, str, str]]:
+    """Shuffled round-robin of (id, name, prompt) so templates spread evenly across a run"""
+    rows = [(t.id, t.name, t.prompt) for t in templates]
+    random.shuffle(rows)
+    return itertools.cycle(rows)
 
 # -------------------------
 # Helper: Get Previous Email Context
 # -------------------------
+def history_queryset():
+    return FollowUp.objects.filter(status__in=["sent", "ready", "queued", "sending"]).order_by("followup_number")
+
+
 def get_email_history(lead: Lead, parent_email: LeadEmailCopy) -> List[dict]:
-    print(f"📜 Fetching email history for lead: {lead.email}")
+    logger.debug("Fetching email history for lead: %s", lead.email)
     history = []
 
     if parent_email:
-        print(f"  → Adding initial email: {parent_email.subject}")
+        logger.debug("Adding initial email: %s", parent_email.subject)
         history.append({
             "type": "initial",
             "subject": parent_email.subject,
@@ -48,12 +80,13 @@ def get_email_history(lead: Lead, parent_email: LeadEmailCopy) -> List[dict]:
             "sent_at": parent_email.sent_at
         })
 
-    previous_followups = FollowUp.objects.filter(
-        lead=lead, status__in=["sent", "ready"]
-    ).order_by("followup_number")
+    # Filled by get_leads_due_for_followup's prefetch; only unprefetched leads hit the DB
+    previous_followups = getattr(lead, "_history_cache", None)
+    if previous_followups is None:
+        previous_followups = history_queryset().filter(lead=lead)
 
     for fu in previous_followups:
-        print(f"  → Adding previous follow-up #{fu.followup_number}: {fu.email_subject}")
+        logger.debug("Adding previous follow-up #%s: %s", fu.followup_number, fu.email_subject)
         history.append({
             "type": f"follow_up_{fu.followup_number}",
             "subject": fu.email_subject,
@@ -61,131 +94,158 @@ def get_email_history(lead: Lead, parent_email: LeadEmailCopy) -> List[dict]:
             "sent_at": fu.sent_at or fu.scheduled_at
         })
 
-    print(f"  → Total emails in history: {len(history)}")
+    logger.debug("Total emails in history: %d", len(history))
     return history
 
 # -------------------------
 # GPT Prompt Builder (JSON output)
 # -------------------------
-def build_followup_prompt(
-        lead: Lead,
-        template_content: str,
-        followup_number: int,
-        email_history: List[dict]
-) -> str:
-    print(f"📝 Building GPT prompt for follow-up #{followup_number} for {lead.email}")
-    stage_context = {
-        1: "FIRST follow-up (32 hours after initial email). Different angle, brief and curious, reference company/website.",
-        2: "SECOND follow-up (72 hours after first follow-up). Different approach, thoughtful question, genuine interest.",
-        3: "FINAL follow-up (120 hours after second follow-up). Last gentle touchpoint, acknowledge previous outreach, easy out."
-    }
-
-    history_text = "\n".join(
-        [f"{idx+1}. [{email['type']}] Subject: {email['subject']} | Body: {email['body']}"
-         for idx, email in enumerate(email_history)]
-    ) or "No previous emails."
-
-    prompt = f"""
+STAGE_CONTEXT = {
+    1: "FIRST follow-up (32 hours after initial email). Different angle, brief and curious, reference company/website.",
+    2: "SECOND follow-up (72 hours after first follow-up). Different approach, thoughtful question, genuine interest.",
+    3: "FINAL follow-up (120 hours after second follow-up). Last gentle touchpoint, acknowledge previous outreach, easy out."
+}
+
+# Everything except the leads; kept first so OpenAI's prompt cache can match the shared prefix
+PROMPT_PREFIX_TEMPLATE = """
 You are an expert B2B email copywriter.
 
 Rules:
 - Casual, human, 2-3 sentences max.
 - Each follow-up must be distinct and fresh.
 - Soft, non-pushy CTAs.
-- Do NOT repeat previous email angles or phrasing.
-- Output JSON ONLY. Do NOT add any text outside the JSON. Keys must be: "subject_line", "body" 
-{{
-  "subject_line": " ",
-  "body": " "
-}}
+- Do NOT repeat the angles or phrasing of a lead's previous emails ("history").
+- Write one follow-up for EVERY lead in the list at the end.
 
 Follow-up stage info:
-{stage_context[followup_number]}
+{stage_context}
 
 Template guidance (adapt, don't copy):
 {template_content}
 
-Lead info:
-- Name: {lead.first_name} {lead.last_name}
-- Company: {lead.company}
-- Website: {lead.website}
-- Title: {lead.title}
-- Description: {lead.seo_description}
-
-Previous emails:
-{history_text}
-
 SUBJECT LINE GUIDANCE: - Make it catchy, intriguing, or curiosity-driven. - Include something personal about the lead or their company if possible. - Use different approaches each time: questions, numbers, insights, or bold statements. - Do NOT start every subject with 'Quick thought' or 'Quick check-in'. - Aim for 3-6 words maximum.
 
-Output ONLY JSON with keys "subject_line" and "body":
+Output ONLY a JSON object, with one entry per lead, echoing its lead_id:
 {{
-  "subject_line": " ",
-  "body": " "
+  "results": [
+    {{"lead_id": " ", "subject_line": " ", "body": " "}}
+  ]
 }}
 No greetings or signatures, just the core message.
+
+Leads (JSON):
 """
-    print(f"  → Prompt built (length {len(prompt)} characters)")
+
+
+@lru_cache(maxsize=64)
+def render_prompt_prefix(followup_number: int, template_content: str) -> str:
+    """Invariant part of the prompt, rendered once per (stage, template)"""
+    return PROMPT_PREFIX_TEMPLATE.format(
+        stage_context=STAGE_CONTEXT[followup_number],
+        template_content=template_content,
+    )
+
+
+def build_batched_followup_prompt(
+        leads_slice: List[Tuple[Lead, List[dict]]],
+        prefix: str
+) -> str:
+    """Shared prefix plus a JSON list of the chunk's (lead, email_history) pairs"""
+    leads_json = json.dumps([
+        {
+            "lead_id": str(lead.id),
+            "name": f"{lead.first_name} {lead.last_name}",
+            "company": lead.company,
+            "website": lead.website,
+            "title": lead.title,
+            "description": lead.seo_description,
+            "history": [
+                {"type": email["type"], "subject": email["subject"], "body": email["body"]}
+                for email in email_history
+            ],
+        }
+        for lead, email_history in leads_slice
+    ], ensure_ascii=False)
+
+    prompt = prefix + leads_json
+    logger.debug("Prompt built for %d leads (length %d characters)", len(leads_slice), len(prompt))
     return prompt
 
 # -------------------------
 # GPT JSON Parser
 # -------------------------
-def parse_email_response(raw_output: str) -> Tuple[Optional[str], Optional[str]]:
-    print(f"💬 Parsing GPT response...")
-    print(f"  → Raw output: {raw_output[:200]}...")  # truncate for readability
+def parse_batched_response(raw_output: str) -> Dict[str, Tuple[str, str]]:
+    """Map lead_id -> (subject, body); entries missing either part are dropped"""
+    logger.debug("Raw GPT output: %.200s", raw_output)
+    # response_format=json_object guarantees bare JSON, so no fence stripping is needed
     try:
         data = json.loads(raw_output)
-        subject = data.get("subject_line", "").strip()
-        body = data.get("body", "").strip()
-        if not subject or not body:
-            print("  ❌ JSON parse: subject or body missing")
-            return None, None
-        print(f"  → Parsed subject: {subject}")
-        print(f"  → Parsed body: {body[:60]}...")
-        return subject, body
-    except Exception as e:
-        print(f"❌ JSON parse error: {e}")
-        return None, None
+    except json.JSONDecodeError as e:
+        logger.error("JSON parse error: %s", e)
+        return {}
+    results = data.get("results", []) if isinstance(data, dict) else []
+
+    emails = {}
+    for item in results:
+        if not isinstance(item, dict):
+            continue
+        subject = (item.get("subject_line") or "").strip()
+        body = (item.get("body") or "").strip()
+        if subject and body:
+            emails[str(item.get("lead_id"))] = (subject, body)
+    logger.debug("Parsed %d email(s)", len(emails))
+    return emails
 
 # -------------------------
-# Generate Follow-Up Email
+# Generate Follow-Up Emails (one GPT call per chunk of leads)
 # -------------------------
-def generate_followup_email(
-        lead: Lead,
-        parent_email: LeadEmailCopy,
-        template_content: str,
-        followup_number: int
-) -> Tuple[Optional[str], Optional[str]]:
-    email_history = get_email_history(lead, parent_email)
-    prompt = build_followup_prompt(lead, template_content, followup_number, email_history)
-
-    for attempt in range(MAX_GPT_RETRIES):
-        print(f"  → GPT attempt {attempt+1}/{MAX_GPT_RETRIES}")
-        try:
-            response = client.chat.completions.create(
-                model=GPT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=GPT_TEMPERATURE,
-                max_tokens=GPT_MAX_TOKENS
-            )
-            raw = response.choices[0].message.content
-            print(f"    → GPT raw response received (length {len(raw)})")
-            subject, body = parse_email_response(raw)
-            if subject and body:
-                print(f"    ✅ GPT returned valid email")
-                return subject, body
-            else:
-                print(f"    ⚠️ GPT parse failed, retrying...")
-        except Exception as e:
-            print(f"    ❌ GPT API error: {e}, retrying...")
-            time.sleep(2 ** attempt)
-    return None, None
+async def generate_followup_batch(
+        client: AsyncOpenAI,
+        prompt: str,
+        expected: int,
+        semaphore: asyncio.Semaphore
+) -> Dict[str, Tuple[str, str]]:
+    emails = {}
+    async with semaphore:
+        for attempt in range(MAX_GPT_RETRIES):
+            logger.debug("GPT attempt %d/%d", attempt + 1, MAX_GPT_RETRIES)
+            try:
+                response = await client.chat.completions.create(
+                    model=GPT_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=GPT_TEMPERATURE,
+                    max_tokens=GPT_MAX_TOKENS * expected,
+                    response_format={"type": "json_object"}
+                )
+                raw = response.choices[0].message.content
+                logger.debug("GPT raw response received (length %d)", len(raw))
+                emails = parse_batched_response(raw)
+                if len(emails) == expected:
+                    logger.debug("GPT returned valid emails")
+                    return emails
+                logger.warning("GPT returned %d/%d emails, retrying", len(emails), expected)
+            except Exception as e:
+                logger.error("GPT API error: %s, retrying", e)
+                await asyncio.sleep(2 ** attempt)
+    # Keep whatever came back; missing leads are picked up again next run
+    return emails
+
+
+async def generate_followup_batches(prompts: List[Tuple[str, int]]) -> List[Dict[str, Tuple[str, str]]]:
+    """Run every chunk's GPT call concurrently, at most MAX_CONCURRENCY in flight"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    # A pooled httpx connection can't outlive the loop it was opened on, and Celery workers
+    # call asyncio.run() once per task, so each run opens (and closes) its own client
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=openai_async_http_client()) as client:
+        return await asyncio.gather(*(
+            generate_followup_batch(client, prompt, expected, semaphore) for prompt, expected in prompts
+        ))
 
 # -------------------------
 # Find Leads Ready for Follow-Up
 # -------------------------
 def get_leads_due_for_followup(followup_number: int, batch_size: int) -> List[tuple]:
-    print(f"🔎 Fetching leads due for follow-up #{followup_number}")
+    logger.debug("Fetching leads due for follow-up #%d", followup_number)
     now = timezone.now()
     cutoff_time = now - timedelta(hours=FOLLOWUP_CADENCE[followup_number])
     leads_due = []
@@ -197,13 +257,13 @@ def get_leads_due_for_followup(followup_number: int, batch_size: int) -> List[tu
             lead__email_verified=True,
         ).exclude(
             followup_emails__followup_number=1
-        ).select_related('lead').prefetch_related(
-            Prefetch('followup_emails', queryset=FollowUp.objects.all())
+        ).select_related('lead').defer('lead__keywords', 'lead__technologies').prefetch_related(
+            Prefetch('lead__followups', queryset=history_queryset(), to_attr='_history_cache')
         )[:batch_size]
 
         for le in lead_emails:
             leads_due.append((le.lead, le))
-        print(f"  → Found {len(lead_emails)} lead emails for follow-up #1")
+        logger.debug("Found %d lead emails for follow-up #1", len(lead_emails))
     else:
         prev_num = followup_number - 1
         prev_followups = FollowUp.objects.filter(
@@ -213,95 +273,242 @@ def get_leads_due_for_followup(followup_number: int, batch_size: int) -> List[tu
             lead__email_verified=True
         ).exclude(
             lead__followups__followup_number=followup_number
-        ).select_related('lead', 'parent_email')[:batch_size]
+        ).select_related('lead', 'parent_email').defer('lead__keywords', 'lead__technologies').prefetch_related(
+            Prefetch('lead__followups', queryset=history_queryset(), to_attr='_history_cache')
+        )[:batch_size]
 
         for fu in prev_followups:
             leads_due.append((fu.lead, fu.parent_email))
-        print(f"  → Found {len(prev_followups)} previous follow-ups for follow-up #{followup_number}")
+        logger.debug("Found %d previous follow-ups for follow-up #%d", len(prev_followups), followup_number)
 
     return leads_due
 
+# -------------------------
+# OpenAI Batch API (overnight, half price)
+# -------------------------
+def pending_batch_ids() -> List[str]:
+    """Follow-up jobs submitted earlier that haven't finished yet"""
+    return [
+        batch.id for batch in batch_client.batches.list(limit=100)
+        if (batch.metadata or {}).get("job") == BATCH_JOB_TAG and batch.status not in BATCH_DONE_STATUSES
+    ]
+
+
+def enqueue_batch(batch_size: int = BATCH_SIZE) -> Optional[str]:
+    """Submit one request per due lead to the Batch API; ingest_batch() picks up the results"""
+    pending = pending_batch_ids()
+    if pending:
+        logger.info("Follow-up batch %s still running, not enqueueing another", pending[0])
+        return None
+
+    templates = get_templates()
+    if not templates:
+        logger.error("No templates found")
+        return None
+    tpl_iter = template_cycle(templates)
+
+    lines = []
+    for followup_number in sorted(FOLLOWUP_CADENCE.keys()):
+        for lead, parent_email in get_leads_due_for_followup(followup_number, batch_size):
+            tid, _, tprompt = next(tpl_iter)
+            prompt = build_batched_followup_prompt(
+                [(lead, get_email_history(lead, parent_email))],
+                render_prompt_prefix(followup_number, tprompt)
+            )
+            lines.append(json.dumps({
+                # Everything ingest needs to rebuild the FollowUp row
+                "custom_id": f"{followup_number}:{lead.id}:{parent_email.id if parent_email else 0}:{tid}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": GPT_MODEL,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": GPT_TEMPERATURE,
+                    "max_tokens": GPT_MAX_TOKENS,
+                    "response_format": {"type": "json_object"},
+                },
+            }))
+
+    if not lines:
+        logger.info("No leads due for follow-up")
+        return None
+
+    batch_file = batch_client.files.create(
+        file=("followup_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = batch_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"job": BATCH_JOB_TAG}
+    )
+    logger.info("Submitted follow-up batch %s with %d requests", batch.id, len(lines))
+    return batch.id
+
+
+def ingest_batch(batch_id: str) -> int:
+    """Create FollowUp rows from a finished batch; safe to run more than once"""
+    batch = batch_client.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.info("Batch %s is %s, nothing to ingest yet", batch_id, batch.status)
+        return 0
+
+    results = []
+    for line in batch_client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        followup_number, lead_id, parent_id, template_id = map(int, item["custom_id"].split(":"))
+        emails = parse_batched_response(response["body"]["choices"][0]["message"]["content"])
+        subject, body = emails.get(str(lead_id), (None, None))
+        if subject and body:
+            results.append((followup_number, lead_id, parent_id or None, template_id, subject, body))
+
+    leads = Lead.objects.in_bulk([r[1] for r in results])
+    # Leads that already got this stage (e.g. batch ingested before) are skipped
+    existing = set(
+        FollowUp.objects.filter(lead_id__in=leads.keys())
+        .values_list("lead_id", "followup_number")
+    )
+
+    now = timezone.now()
+    to_create = [
+        FollowUp(
+            lead_id=lead_id,
+            parent_email_id=parent_id,
+            template_type="follow_up",
+            followup_number=followup_number,
+            template_id=template_id,
+            email_subject=subject,
+            email_body=body,
+            scheduled_at=now,
+            ready_for_followup=True,
+            status="ready"
+        )
+        for followup_number, lead_id, parent_id, template_id, subject, body in results
+        if lead_id in leads and (lead_id, followup_number) not in existing
+    ]
+    FollowUp.objects.bulk_create(to_create, batch_size=500)
+    logger.info("Batch %s: created %d follow-up(s)", batch_id, len(to_create))
+    return len(to_create)
+
 # -------------------------
 # Main Execution
 # -------------------------
-def main(batch_size: int = BATCH_SIZE, dry_run: bool = False):
+def run_followup_generation(stages: List[int], batch_size: int = BATCH_SIZE, dry_run: bool = False) -> int:
     now = timezone.now()
     total_created = 0
 
-    print(f"\n{'='*60}")
-    print(f"🚀 Starting Follow-Up Generation Run")
-    print(f"{'='*60}")
-    print(f"Timestamp: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
-    print(f"Batch Size: {batch_size}\n")
+    logger.info("Starting follow-up generation run for stage(s) %s (%s, batch size %d)",
+                stages, "DRY RUN" if dry_run else "LIVE", batch_size)
 
-    templates = list(EmailTemplate.objects.all())
-    print(f"📝 Found {len(templates)} template(s)")
+    templates = get_templates()
+    logger.debug("Found %d template(s)", len(templates))
     if not templates:
-        print("❌ No templates found")
-        return
+        logger.error("No templates found")
+        return 0
+    tpl_iter = template_cycle(templates)
 
-    for followup_number in sorted(FOLLOWUP_CADENCE.keys()):
+    # History lookups and prompts stay sync (ORM); every stage's chunks are collected first
+    jobs = []
+    for followup_number in stages:
         hours = FOLLOWUP_CADENCE[followup_number]
-        print(f"\n{'─'*60}\n📧 Processing Follow-Up #{followup_number} (after {hours}h)\n{'─'*60}")
+        logger.info("Processing follow-up #%d (after %dh)", followup_number, hours)
 
         leads_due = get_leads_due_for_followup(followup_number, batch_size)
         if not leads_due:
-            print(f"✓ No leads due for follow-up #{followup_number}")
+            logger.info("No leads due for follow-up #%d", followup_number)
             continue
 
-        print(f"Found {len(leads_due)} lead(s) ready for follow-up #{followup_number}")
-
-        for idx, (lead, parent_email) in enumerate(leads_due, 1):
-            print(f"\n  [{idx}/{len(leads_due)}] Processing: {lead.email} ({lead.company})")
+        logger.info("Found %d lead(s) ready for follow-up #%d", len(leads_due), followup_number)
 
-            if dry_run:
-                print(f"    → [DRY RUN] Would generate follow-up #{followup_number}")
-                continue
+        if dry_run:
+            for lead, _ in leads_due:
+                logger.info("[DRY RUN] Would generate follow-up #%d for %s", followup_number, lead.email)
+            continue
 
-            template = random.choice(templates)
-            print(f"    → Selected template: {template.name}")
-            print(f"    → Generating content with GPT...")
-            subject, body = generate_followup_email(
-                lead,
-                parent_email,
-                template.prompt,
-                followup_number
+        for start in range(0, len(leads_due), GPT_CHUNK_SIZE):
+            chunk = leads_due[start:start + GPT_CHUNK_SIZE]
+            tid, tname, tprompt = next(tpl_iter)
+            logger.debug("Leads %d-%d/%d using template: %s", start + 1, start + len(chunk), len(leads_due), tname)
+            prompt = build_batched_followup_prompt(
+                [(lead, get_email_history(lead, parent_email)) for lead, parent_email in chunk],
+                render_prompt_prefix(followup_number, tprompt)
             )
+            jobs.append((followup_number, chunk, tid, prompt))
 
+    if not jobs:
+        logger.info("Follow-up generation complete (%s): nothing to generate", "DRY RUN" if dry_run else "LIVE")
+        return 0
+
+    # One event loop (and one client) for the whole run, so the HTTP/2 connection is reused across stages
+    results = asyncio.run(generate_followup_batches([(prompt, len(chunk)) for _, chunk, _, prompt in jobs]))
+
+    to_create = []
+    for (followup_number, chunk, tid, _), emails in zip(jobs, results):
+        for lead, parent_email in chunk:
+            subject, body = emails.get(str(lead.id), (None, None))
             if not subject or not body:
-                print(f"    ❌ Failed to generate content for {lead.email}")
+                logger.warning("Failed to generate content for %s", lead.email)
                 continue
 
-            try:
-                FollowUp.objects.create(
-                    lead=lead,
-                    parent_email=parent_email,
-                    template_type="follow_up",
-                    followup_number=followup_number,
-                    template=template,
-                    email_subject=subject,
-                    email_body=body,
-                    scheduled_at=now,
-                    ready_for_followup=True,
-                    status="ready"
-                )
-                print(f"    ✅ Created follow-up #{followup_number}")
-                print(f"       Subject: {subject[:60]}...")
-                total_created += 1
-            except Exception as e:
-                print(f"    ❌ DB error: {e}")
-                continue
+            to_create.append(FollowUp(
+                lead=lead,
+                parent_email=parent_email,
+                template_type="follow_up",
+                followup_number=followup_number,
+                template_id=tid,
+                email_subject=subject,
+                email_body=body,
+                scheduled_at=now,
+                ready_for_followup=True,
+                status="ready"
+            ))
+
+    try:
+        with transaction.atomic():
+            FollowUp.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+        total_created = len(to_create)
+    except Exception as e:
+        logger.error("DB error: %s", e)
+
+    logger.info("Follow-up generation complete (%s): %d created", "DRY RUN" if dry_run else "LIVE", total_created)
+    return total_created
 
-    print(f"\n{'='*60}")
-    print(f"✅ Follow-Up Generation Complete | Total created: {total_created}")
-    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
-    print(f"{'='*60}\n")
+
+@shared_task
+def generate_followup_stage(followup_number: int, batch_size: int = BATCH_SIZE) -> int:
+    """One stage per task; stages pick disjoint leads, so they can run on separate workers"""
+    return run_followup_generation([followup_number], batch_size)
+
+
+@shared_task
+def generate_all_stages(batch_size: int = BATCH_SIZE):
+    """Beat entry point: fan the stages out across workers"""
+    group(generate_followup_stage.s(n, batch_size) for n in sorted(FOLLOWUP_CADENCE)).apply_async()
+
+
+def main(batch_size: int = BATCH_SIZE, dry_run: bool = False) -> int:
+    return run_followup_generation(sorted(FOLLOWUP_CADENCE), batch_size, dry_run)
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Generate follow-up emails")
     parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--enqueue-batch", action="store_true", help="Submit due follow-ups to the OpenAI Batch API")
+    parser.add_argument("--ingest-batch", metavar="BATCH_ID", help="Create follow-ups from a finished Batch API job")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log per-lead prompt and parsing details")
     args = parser.parse_args()
-    main(batch_size=args.batch_size, dry_run=args.dry_run)
+    setup_queue_logging(logging.DEBUG if args.verbose else logging.INFO)
+
+    if args.enqueue_batch:
+        enqueue_batch(batch_size=args.batch_size)
+    elif args.ingest_batch:
+        ingest_batch(args.ingest_batch)
+    else:
+        main(batch_size=args.batch_size, dry_run=args.dry_run)
@@ -1,6 +1,6 @@
 import os
 import sys
-import time
+from datetime import timedelta
 from celery import shared_task
 from django.utils import timezone
 import django
@@ -20,19 +20,96 @@ from system.models import Lead, FollowUp
 # ----------------------------
 EMAILS_PER_RUN = 10       # number of follow-ups to send per run
 DELAY_BETWEEN_EMAILS = 60 # seconds between emails to avoid spam triggers
+CLAIM_TIMEOUT = timedelta(minutes=30)  # queued/sending rows older than this lost their worker
 # ----------------------------
 
+# Only what send_followup reads or writes; skips the wide text columns on Lead
+SEND_FIELDS = (
+    "id", "email_subject", "email_body", "status", "sent_at",
+    "lead__id", "lead__email", "lead__followup_sent", "lead__last_contacted",
+    "lead__email_provider_used", "lead__email_status",
+)
+
+
+def send_followup(followup):
+    """Send one follow-up through the SMTP rotation and record the outcome"""
+    lead = followup.lead
+    print(f"Processing follow-up: {lead.email}")
+
+    # Rotate SMTP account internally
+    sender_used, success = smtp_client.send_email(
+        subject=followup.email_subject,
+        body=followup.email_body,
+        to_email=lead.email
+    )
+
+    if success:
+        print(f"✔ Follow-up sent successfully from {sender_used} to {lead.email}")
+
+        # Mark follow-up as sent
+        followup.status = 'sent'
+        followup.sent_at = timezone.now()
+        followup.save(update_fields=["status", "sent_at"])
+
+        # Update lead tracking
+        lead.followup_sent = True
+        lead.last_contacted = timezone.now()
+        lead.email_provider_used = sender_used
+        lead.save(update_fields=["followup_sent", "last_contacted", "email_provider_used"])
+    else:
+        print(f"❌ Failed sending follow-up to {lead.email}")
+        lead.email_status = "followup_failed"
+        lead.save(update_fields=["email_status"])
+
+    return success
+
+
+@shared_task(rate_limit="10/m")
+def send_single_followup(followup_id):
+    """Send one queued follow-up; scheduled with an ETA instead of sleeping in the batch"""
+    # Claim the follow-up so a re-queued duplicate task can't send it twice;
+    # scheduled_at stamps the claim so a dead worker's row is reclaimed later
+    claimed = FollowUp.objects.filter(pk=followup_id, status='queued').update(
+        status='sending', ready_for_followup=False, scheduled_at=timezone.now()
+    )
+    if not claimed:
+        return "Already claimed"
+
+    followup = FollowUp.objects.select_related("lead").only(*SEND_FIELDS).get(pk=followup_id)
+    try:
+        success = send_followup(followup)
+    except Exception as e:
+        print(f"❌ Error processing {followup.lead.email}: {e}")
+        success = False
+
+    if not success:
+        FollowUp.objects.filter(pk=followup_id, status='sending').update(
+            status='ready', ready_for_followup=True
+        )
+    return "Sent" if success else "Failed"
+
+
 @shared_task
 def send_followup_batch():
     print("="*60)
     print("🚀 Starting follow-up batch run…")
     print("="*60)
 
-    followups_to_send = FollowUp.objects.filter(
+    now = timezone.now()
+
+    # Rows whose task never ran or whose worker died mid-send go back to ready
+    reclaimed = FollowUp.objects.filter(
+        status__in=('queued', 'sending'),
+        scheduled_at__lt=now - CLAIM_TIMEOUT
+    ).update(status='ready', ready_for_followup=True)
+    if reclaimed:
+        print(f"♻ Reclaimed {reclaimed} stalled follow-ups.")
+
+    followups_to_send = list(FollowUp.objects.filter(
         ready_for_followup=True,
         status='ready',
         lead__email_verified=True
-    ).select_related("lead")[:EMAILS_PER_RUN]
+    ).values_list("id", flat=True)[:EMAILS_PER_RUN])
 
     if not followups_to_send:
         print("No follow-ups ready to send.")
@@ -40,44 +117,20 @@ def send_followup_batch():
 
     print(f"Found {len(followups_to_send)} follow-ups ready.")
 
-    for i, followup in enumerate(followups_to_send):
-        lead = followup.lead
-        print("-"*50)
-        print(f"Processing follow-up #{i+1}: {lead.email}")
-
-        subject = followup.email_subject
-        body = followup.email_body
-
-        # Rotate SMTP account internally
-        sender_used, success = smtp_client.send_email(
-            subject=subject,
-            body=body,
-            to_email=lead.email
-        )
-
-        if success:
-            print(f"✔ Follow-up sent successfully from {sender_used} to {lead.email}")
-
-            # Mark follow-up as sent
-            followup.status = 'sent'
-            followup.sent_at = timezone.now()
-            followup.save()
-
-            # Update lead tracking
-            lead.followup_sent = True
-            lead.last_contacted = timezone.now()
-            lead.email_provider_used = sender_used
-            lead.save()
-        else:
-            print(f"❌ Failed sending follow-up to {lead.email}")
-            lead.email_status = "followup_failed"
-            lead.save()
-
-        print(f"⏳ Waiting {DELAY_BETWEEN_EMAILS}s before next follow-up...")
-        time.sleep(DELAY_BETWEEN_EMAILS)
-
-    print("✅ Follow-up batch completed.")
-    return "Follow-up batch done"
+    # The broker holds each send until its ETA; no worker slot sits in sleep().
+    # Marking rows queued keeps the next beat run from queueing them again.
+    queued = 0
+    for followup_id in followups_to_send:
+        eta = now + timedelta(seconds=queued * DELAY_BETWEEN_EMAILS)
+        if not FollowUp.objects.filter(pk=followup_id, status='ready').update(
+            status='queued', scheduled_at=eta
+        ):
+            continue
+        send_single_followup.apply_async(args=[followup_id], eta=eta)
+        queued += 1
+
+    print(f"✅ Queued {queued} follow-ups.")
+    return "Follow-up batch queued"
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 import sys
-import time
+import random
+from datetime import timedelta
 from celery import shared_task
 from django.utils import timezone
 import django
@@ -9,31 +10,121 @@ print("🔧 Setting up Django environment...")
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, PROJECT_ROOT)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "genesis_engine.settings")
 
 django.setup()
 print("✅ Django setup complete.")
 
-from system.agent.outreach.email_client import smtp_client
-from system.models import Lead, LeadEmailCopy
+from outbound.engine.outreach.email_client import smtp_client
+from django.db.models import Q
+from outbound.models import Lead, LeadEmailCopy
 
 # ----------------------------
+HEALTH_CHECK_INBOX = "michaelogaje033@gmail.com"
 EMAILS_PER_RUN = 10       # number of emails to send per run
 DELAY_BETWEEN_EMAILS = 60 # seconds between emails to avoid spam triggers
+CLAIM_TIMEOUT = timedelta(minutes=15)  # a claim older than this belongs to a dead worker
 # ----------------------------
 
+# Only what send_copy reads or writes; skips the wide text columns on Lead
+SEND_FIELDS = (
+    "id", "subject", "body", "sent", "sent_at", "updated_at",
+    "lead__id", "lead__email", "lead__email_sent", "lead__email_provider_used",
+    "lead__last_contacted", "lead__email_status",
+)
+
+def send_copy(copy, account):
+    """Send one generated email through `account` and record the outcome"""
+    lead = copy.lead
+    print(f"Processing lead: {lead.email}")
+
+    sender_used, success = smtp_client.send_email(
+        subject=copy.subject,
+        body=copy.body,
+        to_email=lead.email,
+        account=account
+    )
+
+    if success:
+        print(f"✔ Email sent successfully from {sender_used} to {lead.email}")
+
+        copy.sent = True
+        copy.sent_at = timezone.now()
+        copy.save(update_fields=["sent", "sent_at", "updated_at"])
+
+        lead.email_sent = True
+        lead.email_provider_used = sender_used
+        lead.last_contacted = timezone.now()
+        lead.save(update_fields=["email_sent", "email_provider_used", "last_contacted"])
+    else:
+        print(f"❌ Failed sending to {lead.email}")
+        lead.email_status = "send_failed"
+        lead.save(update_fields=["email_status"])
+
+    return success
+
+
+def unclaimed(now):
+    """Copies no live send task holds: never claimed, or claimed by a worker that died"""
+    return Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_TIMEOUT)
+
+
+def account_for(user):
+    """Look up an SMTP account config by its login"""
+    return next((a for a in smtp_client.accounts if a["EMAIL_HOST_USER"] == user), None)
+
+
+@shared_task(rate_limit="10/m")
+def send_one_email(copy_id, sender):
+    """Send one queued copy; scheduled with a countdown instead of sleeping in the batch"""
+    # Claim the copy so a re-queued duplicate task can't send it twice. The claim is a
+    # timestamp rather than sent=True, so a worker killed mid-send doesn't strand the
+    # copy: once the claim is older than CLAIM_TIMEOUT the next batch queues it again.
+    now = timezone.now()
+    if not LeadEmailCopy.objects.filter(unclaimed(now), pk=copy_id, sent=False).update(claimed_at=now):
+        return "Already claimed"
+
+    copy = LeadEmailCopy.objects.select_related("lead").only(*SEND_FIELDS).get(pk=copy_id)
+    try:
+        success = send_copy(copy, account_for(sender))
+    except Exception as e:
+        print(f"❌ Error processing {copy.lead.email}: {e}")
+        success = False
+
+    if not success:
+        LeadEmailCopy.objects.filter(pk=copy_id, claimed_at=now).update(claimed_at=None)
+    return "Sent" if success else "Failed"
+
+
+@shared_task
+def health_check_smtp():
+    """One canary email per sending account; meant for a periodic (e.g. 15 min) beat schedule"""
+    results = {}
+    for account in smtp_client.accounts:
+        sender_used, success = smtp_client.send_email(
+            subject="Test Email — Outreach System Health Check",
+            body=f"Test OK from {account['EMAIL_HOST_USER']}",
+            to_email=HEALTH_CHECK_INBOX,
+            account=account
+        )
+        print(f"{'✔' if success else '❌'} Health check from {sender_used}")
+        results[sender_used] = success
+    return results
+
+
 @shared_task
 def send_rotating_outreach_batch():
     print("="*60)
     print("🚀 Starting outreach batch run…")
     print("="*60)
 
-    leads_to_send = LeadEmailCopy.objects.filter(
+    leads_to_send = list(LeadEmailCopy.objects.filter(
+        unclaimed(timezone.now()),
         ready_to_send=True,
         sent=False,
         lead__ready_to_send=True,
         lead__email_sent=False
-    ).select_related("lead")[:EMAILS_PER_RUN]  # limit per run
+    ).only("id")[:EMAILS_PER_RUN])  # limit per run
 
     if not leads_to_send:
         print("No leads ready to send.")
@@ -41,49 +132,17 @@ def send_rotating_outreach_batch():
 
     print(f"Found {len(leads_to_send)} leads ready.")
 
+    # Round-robin copies over inboxes; each inbox gets its own jittered send schedule
+    # so the batch returns immediately and the pacing lives in the broker
+    accounts = smtp_client.accounts
     for i, copy in enumerate(leads_to_send):
-        lead = copy.lead
-        print("-"*50)
-        print(f"Processing lead #{i+1}: {lead.email}")
-
-        subject = copy.subject
-        body = copy.body
-
-        # Rotate SMTP account internally
-        sender_used, success = smtp_client.send_email(
-            subject=subject,
-            body=body,
-            to_email=lead.email
-        )
-
-        # Send test email on each iteration
-        smtp_client.send_email(
-            subject="Test Email — Outreach System Health Check",
-            body=f"Test OK from {sender_used}",
-            to_email="michaelogaje033@gmail.com"
-        )
-
-        if success:
-            print(f"✔ Email sent successfully from {sender_used} to {lead.email}")
-
-            copy.sent = True
-            copy.sent_at = timezone.now()
-            copy.save()
-
-            lead.email_sent = True
-            lead.email_provider_used = sender_used
-            lead.last_contacted = timezone.now()
-            lead.save()
-        else:
-            print(f"❌ Failed sending to {lead.email}")
-            lead.email_status = "send_failed"
-            lead.save()
-
-        print(f"⏳ Waiting {DELAY_BETWEEN_EMAILS}s before next email...")
-        time.sleep(DELAY_BETWEEN_EMAILS)
+        account = accounts[i % len(accounts)]
+        slot = i // len(accounts)
+        countdown = int(slot * DELAY_BETWEEN_EMAILS + random.uniform(0, 0.5) * DELAY_BETWEEN_EMAILS) if slot else 0
+        send_one_email.apply_async(args=[copy.id, account["EMAIL_HOST_USER"]], countdown=countdown)
 
-    print("✅ Batch completed.")
-    return "Batch done"
+    print(f"✅ Queued {len(leads_to_send)} sends across {len(accounts)} inboxes.")
+    return "Batch queued"
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import random
 from celery import shared_task
 from django.utils import timezone
@@ -19,7 +18,6 @@ from system.agent.outreach.email_client import smtp_client
 
 # ----------------------------
 EMAILS_PER_RUN = 30       # emails to send per run
-DELAY_BETWEEN_EMAILS = 1 # seconds
 # ----------------------------
 
 # Warmup inboxes
@@ -75,6 +73,15 @@ BODIES = [
 ]
 
 # ----------------------------
+@shared_task
+def send_warmup_group(sender, messages):
+    """Send one account's share of the warmup batch over a single SMTP session"""
+    account = next(a for a in smtp_client.accounts if a["EMAIL_HOST_USER"] == sender)
+    sent = smtp_client.send_many(messages, account)
+    print(f"✔ {sender}: {sent}/{len(messages)} warmup emails sent")
+    return sent
+
+
 @shared_task
 def run_warmup_batch():
     print("="*60)
@@ -84,28 +91,20 @@ def run_warmup_batch():
     inbox_pool = WARMUP_INBOXES.copy()
     random.shuffle(inbox_pool)  # randomize inbox order
 
+    # Precompute every (subject, body, to) triple and split them round-robin across accounts
+    accounts = smtp_client.accounts
+    groups = {account["EMAIL_HOST_USER"]: [] for account in accounts}
     for i in range(EMAILS_PER_RUN):
         to_email = inbox_pool[i % len(inbox_pool)]  # cycle if run > inbox count
+        sender = accounts[i % len(accounts)]["EMAIL_HOST_USER"]
+        groups[sender].append((random.choice(SUBJECTS), random.choice(BODIES), to_email))
 
-        subject = random.choice(SUBJECTS)
-        body = random.choice(BODIES)
-
-        sender_used, success = smtp_client.send_email(
-            subject=subject,
-            body=body,
-            to_email=to_email
-        )
-
-        if success:
-            print(f"✔ Warmup email sent from {sender_used} → {to_email}")
-        else:
-            print(f"❌ Failed warmup email from {sender_used} → {to_email}")
-
-        print(f"⏳ Waiting {DELAY_BETWEEN_EMAILS}s before next email…")
-        time.sleep(DELAY_BETWEEN_EMAILS)
+    for sender, messages in groups.items():
+        if messages:
+            send_warmup_group.delay(sender, messages)
 
-    print("✅ Warmup batch completed.")
-    return "Batch done"
+    print(f"✅ Queued {EMAILS_PER_RUN} warmup emails across {len(accounts)} account(s).")
+    return "Batch queued"
 
 
 if __name__ == "__main__":
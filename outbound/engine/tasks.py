@@ -0,0 +1,23 @@
+from celery import shared_task
+
+from outbound.engine.utils import flush_pending_opens
+
+
+@shared_task
+def flush_pixel_opens():
+    """
+    Write opens buffered by the tracking pixel. With REDIS_URL set, opens only
+    reach the DB through this task, so it must be on the beat schedule of the
+    Celery app that runs these tasks, e.g.
+
+        app.conf.beat_schedule = {
+            "flush-pixel-opens": {
+                "task": "outbound.engine.tasks.flush_pixel_opens",
+                "schedule": 5.0,
+            },
+        }
+
+    and a beat process must be running (celery -A <app> beat). Ids stay in
+    Redis until then, so nothing is lost while the schedule is missing.
+    """
+    return flush_pending_opens()
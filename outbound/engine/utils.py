@@ -0,0 +1,186 @@
+"""
+Shared helpers for the lead generation and outreach engine
+"""
+
+import atexit
+import hashlib
+import logging
+import logging.handlers
+import math
+import queue
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional
+
+import httpx
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+# ---------------- Bloom Filters ----------------
+class BloomFilter:
+    """Fixed-capacity Bloom filter for cheap approximate membership checks"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Derive k bit positions from one digest (Kirsch-Mitzenmacher double hashing)"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by stacking larger filters once the current one is full"""
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def add(self, item: str) -> bool:
+        """Add item; returns False if it was (probably) already present"""
+        if item in self:
+            return False
+
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            level = len(self.filters)
+            self.filters.append(BloomFilter(
+                capacity=self.initial_capacity * (self.growth ** level),
+                # Geometric series keeps the compounded error rate under error_rate
+                error_rate=self.error_rate * (1 - self.tightening) * (self.tightening ** level),
+            ))
+
+        self.filters[-1].add(item)
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+
+# ---------------- LLM Response Cache ----------------
+class LLMCache:
+    """Exact-match cache of LLM responses on top of Django's cache framework"""
+
+    def __init__(self, namespace: str = "llm", ttl: int = 86400):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def key(self, model: str, temperature: float, prompt: str) -> str:
+        """Model and temperature are part of the key so sampling settings never share entries"""
+        digest = hashlib.sha256(f"{model}\0{temperature}\0{prompt}".encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        return cache.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        cache.set(key, value, self.ttl)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await cache.aget(key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await cache.aset(key, value, self.ttl)
+
+
+# ---------------- OpenAI HTTP Transport ----------------
+# HTTP/2 multiplexes concurrent completions over one TLS connection (needs h2)
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+def openai_http_client(timeout: float = 60.0) -> httpx.Client:
+    return httpx.Client(http2=True, limits=OPENAI_HTTP_LIMITS, timeout=httpx.Timeout(timeout))
+
+
+def openai_async_http_client(timeout: float = 60.0) -> httpx.AsyncClient:
+    return httpx.AsyncClient(http2=True, limits=OPENAI_HTTP_LIMITS, timeout=httpx.Timeout(timeout))
+
+
+# ---------------- Logging ----------------
+def setup_queue_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Route root logging through a queue so workers never block on stdout writes"""
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# ---------------- Open Tracking Buffer ----------------
+# The pixel view SADDs lead ids here; flush_pending_opens() writes them in bulk.
+# Without REDIS_URL both return None and the view updates the DB directly.
+PENDING_OPENS_KEY = "opens:pending"
+# A flush renames the pending set here and only removes ids once their UPDATE succeeded
+PROCESSING_OPENS_KEY = "opens:processing"
+
+
+@lru_cache(maxsize=1)
+def open_buffer_redis() -> Optional[redis.Redis]:
+    return redis.Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+
+@lru_cache(maxsize=1)
+def open_buffer_aredis() -> Optional[redis.asyncio.Redis]:
+    return redis.asyncio.Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+
+def flush_pending_opens(batch_size: int = 1000) -> int:
+    """Drain buffered opens into LeadEmailCopy; returns how many copies were newly marked opened"""
+    from outbound.models import LeadEmailCopy
+
+    r = open_buffer_redis()
+    if r is None:
+        return 0
+
+    # Atomically set the buffer aside; new opens start a fresh pending set. RENAMENX leaves
+    # an unfinished processing set (DB error, crashed worker) alone so it's drained first.
+    try:
+        r.renamenx(PENDING_OPENS_KEY, PROCESSING_OPENS_KEY)
+    except redis.ResponseError:
+        pass  # nothing pending
+
+    marked = 0
+    while True:
+        lead_ids = r.srandmember(PROCESSING_OPENS_KEY, batch_size)
+        if not lead_ids:
+            return marked
+        # opened=False keeps first-open semantics across flushes (and makes retries harmless)
+        marked += LeadEmailCopy.objects.filter(
+            lead_id__in=[int(lead_id) for lead_id in lead_ids], sent=True, opened=False
+        ).update(opened=True, updated_at=timezone.now())
+        r.srem(PROCESSING_OPENS_KEY, *lead_ids)
@@ -0,0 +1,88 @@
+import logging
+
+from asgiref.sync import markcoroutinefunction
+from django.urls import Resolver404, resolve
+
+from outbound.engine.utils import PENDING_OPENS_KEY, open_buffer_aredis
+from outbound.views import _PIXEL_ETAG, _PIXEL_RESPONSE_HEADERS, _TRACKING_GIF
+
+
+logger = logging.getLogger(__name__)
+
+
+# Must match the track_email_open route (api/ + outbound.url)
+PIXEL_PATH_PREFIX = "/api/track/open/"
+
+
+class TrackingPixelMiddleware:
+    """
+    Serves the tracking pixel before the rest of the middleware stack runs.
+    The pixel needs no session, CSRF token, auth user or messages, so it is
+    resolved and dispatched here directly. Listed first in MIDDLEWARE.
+    """
+
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        if request.path_info.startswith(PIXEL_PATH_PREFIX):
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                pass
+            else:
+                return await match.func(request, *match.args, **match.kwargs)
+
+        return await self.get_response(request)
+
+
+class TrackingPixelASGIMiddleware:
+    """
+    Wraps the ASGI application (see genesis_engine/asgi.py) and answers pixel
+    GETs straight from the ASGI scope when the Redis open buffer is configured:
+    SADD the lead id, send the prebuilt headers and GIF, never enter Django.
+    Anything else, including every request without Redis, goes to the app.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.pixel_start = {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(k.lower().encode(), v.encode()) for k, v in _PIXEL_RESPONSE_HEADERS.items()],
+        }
+        self.pixel_body = {"type": "http.response.body", "body": _TRACKING_GIF}
+        self.not_modified = {
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [(b"etag", _PIXEL_ETAG.encode())],
+        }
+        self.empty_body = {"type": "http.response.body", "body": b""}
+        self.if_none_match = (b"if-none-match", _PIXEL_ETAG.encode())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET" and scope["path"].startswith(PIXEL_PATH_PREFIX):
+            lead_id = scope["path"][len(PIXEL_PATH_PREFIX):].rstrip("/")
+            buffer = open_buffer_aredis()
+
+            if buffer is not None and lead_id.isdigit():
+                try:
+                    # Revalidations are buffered too, same as in the view: they can be a later copy's first open
+                    await buffer.sadd(PENDING_OPENS_KEY, int(lead_id))
+                except Exception as e:
+                    # Let Django's view handle (and log) this hit instead
+                    logger.error("Open buffer write failed for lead_id %s: %s", lead_id, e)
+                else:
+                    if self.if_none_match in scope["headers"]:
+                        await send(self.not_modified)
+                        await send(self.empty_body)
+                    else:
+                        await send(self.pixel_start)
+                        await send(self.pixel_body)
+                    return
+
+        await self.app(scope, receive, send)
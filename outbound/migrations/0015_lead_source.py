@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-15 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0013_emailtemplate_remove_nurturesequence_lead_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="source",
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+    ]
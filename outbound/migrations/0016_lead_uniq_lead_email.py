@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-15 20:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def dedupe_lead_emails(apps, schema_editor):
+    """Collapse leads sharing an email (case-insensitively) onto the oldest row before the constraint goes on"""
+    Lead = apps.get_model("outbound", "Lead")
+    LeadEmailCopy = apps.get_model("outbound", "LeadEmailCopy")
+
+    # An empty email isn't an address, and would otherwise collide with every other one
+    Lead.objects.filter(email="").update(email=None)
+
+    keepers = {}
+    duplicates = {}
+    for pk, email in Lead.objects.exclude(email__isnull=True).order_by("pk").values_list("pk", "email").iterator():
+        keeper = keepers.setdefault(email.lower(), pk)
+        if keeper != pk:
+            duplicates[pk] = keeper
+
+    # Generated copies follow their lead to the surviving row instead of cascading away
+    for duplicate, keeper in duplicates.items():
+        LeadEmailCopy.objects.filter(lead_id=duplicate).update(lead_id=keeper)
+    Lead.objects.filter(pk__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0015_lead_source"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_lead_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="lead",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"), name="uniq_lead_email"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-15 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0016_lead_uniq_lead_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="scoring_batch_id",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-15 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0017_lead_scoring_batch_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["email_verified", "email_sent", "ready_to_send"],
+                name="lead_send_queue_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leademailcopy",
+            index=models.Index(fields=["sent", "sent_at"], name="copy_sent_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leademailcopy",
+            index=models.Index(
+                fields=["ready_to_send", "sent"], name="copy_send_queue_idx"
+            ),
+        ),
+    ]
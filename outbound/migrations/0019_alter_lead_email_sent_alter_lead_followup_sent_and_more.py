@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-15 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0018_lead_email_copy_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lead",
+            name="email_sent",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="lead",
+            name="followup_sent",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="lead",
+            name="ready_to_send",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="leademailcopy",
+            name="sent_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-15 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0019_alter_lead_email_sent_alter_lead_followup_sent_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leademailcopy",
+            index=models.Index(
+                condition=models.Q(("opened", False), ("sent", True)),
+                fields=["lead"],
+                name="copy_unopened_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-15 21:07
+
+from django.db import migrations, models
+
+
+def dedupe_website_lead_emails(apps, schema_editor):
+    """Keep the first submission for each email, matching what create_lead does from now on"""
+    WebsiteLead = apps.get_model("outbound", "WebsiteLead")
+
+    seen = set()
+    duplicates = []
+    for pk, email in WebsiteLead.objects.order_by("pk").values_list("pk", "email").iterator():
+        if email in seen:
+            duplicates.append(pk)
+        seen.add(email)
+    WebsiteLead.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0020_lead_email_copy_unopened_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_website_lead_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="websitelead",
+            constraint=models.UniqueConstraint(
+                fields=("email",), name="uniq_websitelead_email"
+            ),
+        ),
+    ]
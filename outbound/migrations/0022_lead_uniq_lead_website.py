@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-15 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0021_websitelead_uniq_websitelead_email"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="lead",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("source__in", ("Clutch.co", "Google map"))),
+                fields=("website",),
+                name="uniq_lead_website",
+            ),
+        ),
+    ]
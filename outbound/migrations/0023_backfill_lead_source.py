@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-15 23:10
+
+from django.db import migrations
+
+
+def backfill_scraped_source(apps, schema_editor):
+    """
+    Tag pre-0013 scraper rows "Google map" so uniq_lead_website covers them.
+    Migration 0013 dropped the old source column, and 0015 re-added it as NULL everywhere.
+    Rows carrying CSV contact columns are imports, not scraper rows, and stay NULL.
+    """
+    Lead = apps.get_model("outbound", "Lead")
+
+    taken = set(
+        Lead.objects.filter(source__in=("Clutch.co", "Google map"))
+        .exclude(website__isnull=True)
+        .values_list("website", flat=True)
+    )
+    legacy = (
+        Lead.objects.filter(
+            source__isnull=True,
+            first_name__isnull=True,
+            last_name__isnull=True,
+            title__isnull=True,
+            person_linkedin__isnull=True,
+        )
+        .exclude(website__isnull=True)
+        .exclude(website="")
+        .order_by("pk")
+        .values_list("pk", "website")
+    )
+
+    # Oldest row per website wins; a later copy stays NULL instead of breaking the constraint
+    backfill = []
+    for pk, website in legacy.iterator():
+        if website not in taken:
+            taken.add(website)
+            backfill.append(pk)
+
+    Lead.objects.filter(pk__in=backfill).update(source="Google map")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0022_lead_uniq_lead_website"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_scraped_source, migrations.RunPython.noop),
+    ]
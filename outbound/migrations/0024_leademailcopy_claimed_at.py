@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-15 23:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0023_backfill_lead_source"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="leademailcopy",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
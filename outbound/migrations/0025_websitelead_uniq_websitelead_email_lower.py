@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-15 23:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def lowercase_website_lead_emails(apps, schema_editor):
+    """Keep the first submission per email (case-insensitively) and store the rest lower-cased"""
+    WebsiteLead = apps.get_model("outbound", "WebsiteLead")
+
+    seen = set()
+    duplicates = []
+    for pk, email in WebsiteLead.objects.order_by("pk").values_list("pk", "email").iterator():
+        if email.lower() in seen:
+            duplicates.append(pk)
+        seen.add(email.lower())
+    WebsiteLead.objects.filter(pk__in=duplicates).delete()
+    WebsiteLead.objects.update(email=django.db.models.functions.text.Lower("email"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbound", "0024_leademailcopy_claimed_at"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="websitelead",
+            name="uniq_websitelead_email",
+        ),
+        migrations.RunPython(lowercase_website_lead_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="websitelead",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"), name="uniq_websitelead_email"
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from shortuuid.django_fields import ShortUUIDField
 
 # Create your models here.
@@ -16,6 +17,10 @@ class ICP(models.Model):
         return self.name
 
 
+# Lead.source values written by the scrapers (one row per company)
+SCRAPED_SOURCES = ("Clutch.co", "Google map")
+
+
 class Lead(models.Model):
     INTENT_CHOICES = [
         ("HIGH", "High Intent (Agency / Consultancy)"),
@@ -41,15 +46,17 @@ class Lead(models.Model):
     country = models.CharField(max_length=255, null=True, blank=True)
     technologies = models.TextField(null=True, blank=True)
     seo_description = models.TextField(null=True, blank=True)
+    source = models.CharField(max_length=50, null=True, blank=True, db_index=True)  # e.g. "Clutch.co"
 
     # scoring
     score = models.BooleanField(default=False)
     score_reason = models.TextField(null=True, blank=True)
-    email_sent = models.BooleanField(default=False)
-    followup_sent = models.BooleanField(default=False)
+    email_sent = models.BooleanField(default=False, db_index=True)
+    followup_sent = models.BooleanField(default=False, db_index=True)
     email_provider_used = models.CharField(max_length=50, null=True, blank=True)
     processing = models.BooleanField(default=False)
-    ready_to_send = models.BooleanField(default=False)
+    scoring_batch_id = models.CharField(max_length=64, null=True, blank=True, db_index=True)  # pending OpenAI Batch API job
+    ready_to_send = models.BooleanField(default=False, db_index=True)
 
     email_verified = models.BooleanField(default=False)
     intent = models.CharField(
@@ -64,6 +71,23 @@ class Lead(models.Model):
     replied = models.BooleanField(default=False)
     bounce = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            # Lets scrapers dedup with bulk_create(ignore_conflicts=True) / ON CONFLICT DO NOTHING.
+            # Scraped rows only: CSV imports hold one row per contact, several per company website.
+            models.UniqueConstraint(
+                fields=["website"],
+                condition=models.Q(source__in=SCRAPED_SOURCES),
+                name="uniq_lead_website",
+            ),
+            # CSV imports dedup on email the same way; case-insensitive, like the importer's checks
+            models.UniqueConstraint(Lower("email"), name="uniq_lead_email"),
+        ]
+        indexes = [
+            # Outreach queue: verified leads not yet emailed
+            models.Index(fields=["email_verified", "email_sent", "ready_to_send"], name="lead_send_queue_idx"),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} – {self.email}"
 
@@ -86,7 +110,8 @@ class LeadEmailCopy(models.Model):
     body = models.TextField()  # the generated email content
     ready_to_send = models.BooleanField(default=False)  # set True after generation
     sent = models.BooleanField(default=False)  # set True after email is sent
-    sent_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # send task in flight; stale claims are retried
 
     # metrics for tracking performance
     opened = models.BooleanField(default=False)
@@ -101,6 +126,18 @@ class LeadEmailCopy(models.Model):
         verbose_name = "Lead Email Copy"
         verbose_name_plural = "Lead Email Copies"
         ordering = ['-created_at']
+        indexes = [
+            # Follow-up #1 due scan: sent copies older than the cadence cutoff
+            models.Index(fields=["sent", "sent_at"], name="copy_sent_at_idx"),
+            # Outreach batch: generated copies not yet sent
+            models.Index(fields=["ready_to_send", "sent"], name="copy_send_queue_idx"),
+            # Tracking pixel: partial, so it only holds copies still waiting on a first open
+            models.Index(
+                fields=["lead"],
+                condition=models.Q(sent=True, opened=False),
+                name="copy_unopened_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.lead.first_name} {self.lead.last_name} | Template: {self.template_name}"
@@ -116,6 +153,12 @@ class WebsiteLead(models.Model):
     description = models.CharField(max_length=1000, null=True, blank=True)
     date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # create_lead answers a resubmitted email with the existing row instead of a second one;
+            # case-insensitive like uniq_lead_email
+            models.UniqueConstraint(Lower("email"), name="uniq_websitelead_email"),
+        ]
 
     def __str__(self):
         return self.name
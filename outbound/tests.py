@@ -1,3 +1,524 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from outbound import views
+from outbound.engine.lead_gen import csv_leads, gpt_scoring, manual_scoring
+from outbound.engine.lead_gen.clutch_scraper import LeadManager
+from outbound.engine.outreach import send_outreach
+from outbound.engine.utils import BloomFilter, ScalableBloomFilter
+from outbound.middleware import TrackingPixelASGIMiddleware
+from outbound.models import ICP, Lead, LeadEmailCopy, WebsiteLead
+
+# score_leads builds its OpenAI client at import time, which needs a key (never used here)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+from outbound.engine.lead_gen import score_leads  # noqa: E402
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        items = [f"https://agency-{i}.com" for i in range(5000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertEqual(len(bloom), 5000)
+
+    def test_scalable_filter_keeps_items_across_growth(self):
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        items = [f"lead-{i}@example.com" for i in range(2000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertGreater(len(bloom.filters), 1)
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertFalse(bloom.add(items[0]))
+
+
+class TrackingPixelTests(TestCase):
+    def setUp(self):
+        self.lead = Lead.objects.create(first_name="Ada", email="ada@example.com")
+        self.copy = LeadEmailCopy.objects.create(
+            lead=self.lead, template_name="intro", subject="Hi", body="...", sent=True
+        )
+        self.url = f"/api/track/open/{self.lead.id}/"
+
+    async def drain_open_tasks(self):
+        await asyncio.gather(*list(views._open_tasks))
+
+    async def test_serves_gif_and_records_open(self):
+        response = await self.async_client.get(self.url)
+        await self.drain_open_tasks()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, views._TRACKING_GIF)
+        self.assertEqual(response["Content-Type"], "image/gif")
+        self.assertEqual(response["Content-Length"], str(len(views._TRACKING_GIF)))
+        self.assertEqual(response["ETag"], views._PIXEL_ETAG)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        await self.copy.arefresh_from_db()
+        self.assertTrue(self.copy.opened)
+
+    async def test_revalidation_gets_304_and_still_records_open(self):
+        response = await self.async_client.get(self.url, headers={"If-None-Match": views._PIXEL_ETAG})
+        await self.drain_open_tasks()
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        await self.copy.arefresh_from_db()
+        self.assertTrue(self.copy.opened)
+
+    async def test_unsent_copies_are_not_marked(self):
+        await LeadEmailCopy.objects.filter(pk=self.copy.pk).aupdate(sent=False)
+
+        await self.async_client.get(self.url)
+        await self.drain_open_tasks()
+
+        await self.copy.arefresh_from_db()
+        self.assertFalse(self.copy.opened)
+
+    async def test_bad_lead_id_still_gets_gif(self):
+        response = await self.async_client.get("/api/track/open/not-a-number/")
+        await self.drain_open_tasks()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, views._TRACKING_GIF)
+
+
+class TrackingPixelASGIMiddlewareTests(TestCase):
+    def setUp(self):
+        self.app = mock.AsyncMock()
+        self.middleware = TrackingPixelASGIMiddleware(self.app)
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def scope(self, path="/api/track/open/7/", headers=()):
+        return {"type": "http", "method": "GET", "path": path, "headers": list(headers)}
+
+    async def test_passes_through_without_redis(self):
+        with mock.patch("outbound.middleware.open_buffer_aredis", return_value=None):
+            await self.middleware(self.scope(), None, self.send)
+
+        self.app.assert_awaited_once()
+        self.assertEqual(self.sent, [])
+
+    async def test_buffers_open_and_serves_gif(self):
+        buffer = mock.AsyncMock()
+        with mock.patch("outbound.middleware.open_buffer_aredis", return_value=buffer):
+            await self.middleware(self.scope(), None, self.send)
+
+        buffer.sadd.assert_awaited_once_with("opens:pending", 7)
+        self.app.assert_not_awaited()
+        self.assertEqual(self.sent[0]["status"], 200)
+        self.assertEqual(self.sent[1]["body"], views._TRACKING_GIF)
+
+    async def test_revalidation_is_buffered_too(self):
+        buffer = mock.AsyncMock()
+        headers = [(b"if-none-match", views._PIXEL_ETAG.encode())]
+        with mock.patch("outbound.middleware.open_buffer_aredis", return_value=buffer):
+            await self.middleware(self.scope(headers=headers), None, self.send)
+
+        buffer.sadd.assert_awaited_once_with("opens:pending", 7)
+        self.assertEqual(self.sent[0]["status"], 304)
+        self.assertEqual(self.sent[1]["body"], b"")
+
+
+class LeadManagerTests(TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("outbound.tests")
+
+    def test_untagged_rows_are_preloaded_and_skipped(self):
+        # Legacy and CSV rows have no source, so uniq_lead_website doesn't cover them
+        Lead.objects.create(company="Tallaamo", website="https://tallaamo.fi")
+        manager = LeadManager(self.logger)
+
+        self.assertEqual(len(manager.bloom), 1)
+        self.assertTrue(manager.is_duplicate("https://www.tallaamo.fi/"))
+        self.assertEqual(manager.save_lead("Dup Co", "https://tallaamo.fi", niche="seo"), (False, None))
+        manager.flush()
+
+        self.assertEqual(Lead.objects.filter(website="https://tallaamo.fi").count(), 1)
+
+    def test_other_scraped_sources_are_left_to_the_constraint(self):
+        Lead.objects.create(company="Maps Co", website="https://maps.example", source="Google map")
+        manager = LeadManager(self.logger)
+
+        self.assertEqual(len(manager.bloom), 0)
+        success, _ = manager.save_lead("Maps Co", "https://maps.example", niche="seo")
+        self.assertTrue(success)
+
+        self.assertEqual(manager.flush(), 0)
+        self.assertEqual(manager.count_saved(["https://maps.example"]), 0)
+        self.assertEqual(Lead.objects.filter(website="https://maps.example").count(), 1)
+
+    def test_unnormalized_legacy_websites_are_confirmed(self):
+        Lead.objects.create(company="Aria", website="http://WWW.Parturimo-Aria.fi/")
+        manager = LeadManager(self.logger)
+
+        self.assertTrue(manager.is_duplicate("http://parturimo-aria.fi"))
+
+    def test_flush_writes_buffered_leads(self):
+        manager = LeadManager(self.logger, batch_size=10)
+        manager.save_lead("Acme", "https://WWW.Acme.io/", niche="seo")
+        manager.save_lead("Acme again", "https://acme.io", niche="seo")
+
+        self.assertFalse(Lead.objects.exists())
+        self.assertEqual(manager.flush(), 1)
+
+        lead = Lead.objects.get()
+        self.assertEqual((lead.company, lead.website, lead.source), ("Acme", "https://acme.io", "Clutch.co"))
+        self.assertIn("https://acme.io", manager.bloom)
+
+    def test_save_leads_batch_counts_inserted_rows(self):
+        Lead.objects.create(company="Maps Co", website="https://maps.example", source="Google map")
+        manager = LeadManager(self.logger)
+
+        saved, skipped = manager.save_leads_batch([
+            {"name": "Acme", "website": "https://acme.io"},
+            {"name": "Maps Co", "website": "https://maps.example"},
+            {"name": "", "website": "https://nameless.io"},
+        ])
+
+        self.assertEqual((saved, skipped), (1, 2))
+        self.assertEqual(Lead.objects.count(), 2)
+
+
+class ManualScoringTests(TestCase):
+    def lead(self, **fields):
+        defaults = {"title": "Founder", "employees": 8, "website": "https://acme.io"}
+        return Lead(**{**defaults, **fields})
+
+    def test_hard_gates(self):
+        cases = [
+            (self.lead(employees=40), "Team size outside 2–25"),
+            (self.lead(employees=None), "Team size outside 2–25"),
+            (self.lead(title="Marketing Intern"), "Title not revenue-owning"),
+            (self.lead(website=None, seo_description=None), "No website or description"),
+        ]
+        for lead, reason in cases:
+            with self.subTest(reason=reason):
+                self.assertEqual(manual_scoring.score_and_classify(lead), (False, "REJECTED", reason))
+
+    def test_first_negative_keyword_in_list_order(self):
+        lead = self.lead(company="Acme", seo_description="Real estate and ecommerce marketing agency")
+
+        self.assertEqual(
+            manual_scoring.score_and_classify(lead),
+            (False, "REJECTED", "Negative signal: ecommerce"),
+        )
+
+    def test_intent_levels(self):
+        cases = [
+            # 'seo' nested inside 'seo agency' still counts, and hits keep list order
+            ("We are a B2B SEO agency and marketing agency", True, "HIGH",
+             "Strong intent: marketing agency, seo agency"),
+            ("Paid ads and SEO consulting for B2B", True, "MEDIUM",
+             "Service signals: seo, paid ads, b2b"),
+            ("Bespoke furniture makers", False, "LOW", "Weak service intent"),
+        ]
+        for description, icp, intent, reason in cases:
+            with self.subTest(intent=intent):
+                lead = self.lead(company="Acme", seo_description=description)
+                self.assertEqual(manual_scoring.score_and_classify(lead), (icp, intent, reason))
+
+    def test_main_scores_every_lead_in_batches(self):
+        high = Lead.objects.create(
+            email="a@acme.io", title="CEO", employees=5, seo_description="Growth agency", processing=True
+        )
+        rejected = Lead.objects.create(email="b@big.io", title="CEO", employees=500)
+        low = Lead.objects.create(email="c@shop.io", title="Owner", employees=3, website="https://shop.io")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            manual_scoring.main(batch_size=2)
+
+        for lead in (high, rejected, low):
+            lead.refresh_from_db()
+            self.assertFalse(lead.processing)
+        self.assertEqual((high.score, high.intent, high.score_reason), (True, "HIGH", "Strong intent: growth agency"))
+        self.assertEqual((rejected.score, rejected.intent), (False, "REJECTED"))
+        self.assertEqual((low.score, low.intent), (False, "LOW"))
+
+
+class GPTScoringTests(TestCase):
+    def setUp(self):
+        ICP.objects.create(id=1, name="Small agencies", industry="Marketing")
+        self.a, self.b, self.c = (
+            Lead.objects.create(email=f"{name}@example.com", first_name=name.title()) for name in ("ann", "bob", "cat")
+        )
+        Lead.objects.create(email="done@example.com", score_reason="Scored by an earlier run")
+
+        config = gpt_scoring.Config(batch_size=10, leads_per_request=2)
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            self.scorer = gpt_scoring.LeadScorer(config)
+
+    def test_writes_scores_onto_leads(self):
+        replies = [
+            # GPT answered out of order; results are matched back by email
+            [
+                {"email": "BOB@example.com", "fit_score": 3, "intent_score": 5, "personalization_note": "Solo"},
+                {"email": "ann@example.com", "fit_score": 8, "intent_score": 9, "personalization_note": "Agency"},
+            ],
+            gpt_scoring.GPTProcessingError("GPT API failed"),
+        ]
+        with mock.patch.object(self.scorer, "call_gpt", mock.AsyncMock(side_effect=replies)):
+            stats = self.scorer.process_batch()
+
+        self.assertEqual(stats, {"total_processed": 3, "successful": 2, "failed": 1})
+        for lead in (self.a, self.b, self.c):
+            lead.refresh_from_db()
+        self.assertEqual((self.a.score, self.a.intent, self.a.score_reason), (True, "HIGH", "Fit 8/10, intent 9/10: Agency"))
+        self.assertEqual((self.b.score, self.b.intent), (False, "MEDIUM"))
+        # The failed chunk stays unscored for the next run
+        self.assertIsNone(self.c.score_reason)
+
+    def test_dry_run_writes_nothing(self):
+        self.scorer.dry_run = True
+        reply = [{"email": "ann@example.com", "fit_score": 8, "intent_score": 9, "personalization_note": "Agency"}]
+        with mock.patch.object(self.scorer, "call_gpt", mock.AsyncMock(return_value=reply)):
+            self.scorer.process_batch()
+
+        self.assertEqual(Lead.objects.filter(score_reason__isnull=True).count(), 3)
+
+
+class CSVImportTests(TransactionTestCase):
+    # TransactionTestCase: the importer inserts from its own writer thread and connection
+
+    def write_csv(self, text):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", encoding="utf-8-sig", newline="") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_imports_new_rows_and_counts_duplicates(self):
+        Lead.objects.create(email="Known@Example.com", company="Already here")
+        path = self.write_csv(
+            "First Name,Last Name,Title,Company Name,Email,# Employees,Website\n"
+            "Ann,Lee,Founder,Acme,ANN@acme.io,12,https://acme.io\n"
+            "Bob,Ray,CEO,Bobco,bob@bobco.io,n/a,\n"
+            "Ann,Lee,Founder,Acme,ann@acme.io,12,https://acme.io\n"
+            "Known,Person,Owner,Known,known@example.com,3,\n"
+            "No,Email,Owner,Nobody,,4,\n"
+            "Short,Row\n"
+        )
+
+        stats = csv_leads.import_csv_leads(path, batch_size=2)
+
+        self.assertEqual(stats, {"rows": 6, "inserted": 2, "duplicates": 2, "errors": 2})
+        ann = Lead.objects.get(email="ann@acme.io")
+        self.assertEqual((ann.first_name, ann.title, ann.employees, ann.website), ("Ann", "Founder", 12, "https://acme.io"))
+        bob = Lead.objects.get(email="bob@bobco.io")
+        self.assertEqual((bob.employees, bob.website, bob.score), (None, None, False))
+        self.assertEqual(Lead.objects.count(), 3)
+
+    def test_reimport_inserts_nothing(self):
+        path = self.write_csv("Email,Company Name\nann@acme.io,Acme\nbob@bobco.io,Bobco\n")
+
+        csv_leads.import_csv_leads(path)
+        stats = csv_leads.import_csv_leads(path)
+
+        self.assertEqual(stats, {"rows": 2, "inserted": 0, "duplicates": 2, "errors": 0})
+        self.assertEqual(Lead.objects.count(), 2)
+
+
+class CreateLeadTests(TestCase):
+    url = "/api/lead"
+
+    def post(self, payload):
+        body = payload if isinstance(payload, (bytes, str)) else json.dumps(payload)
+        return self.client.post(self.url, body, content_type="application/json")
+
+    def test_creates_lead(self):
+        response = self.post({"company": "Acme", "email": "Ops@Acme.io", "description": "SEO"})
+
+        self.assertEqual(response.status_code, 201)
+        lead = WebsiteLead.objects.get()
+        self.assertEqual(response.json(), {"message": "Lead created", "id": lead.id})
+        self.assertEqual(lead.company_name, "Acme")
+        self.assertEqual(lead.email, "ops@acme.io")
+
+    def test_duplicate_submission_returns_existing_lead(self):
+        first = self.post({"company": "Acme", "email": "ops@acme.io"})
+        second = self.post({"company": "Acme Ltd", "email": "ops@acme.io"})
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), {"message": "Lead already exists", "id": first.json()["id"]})
+        self.assertEqual(WebsiteLead.objects.count(), 1)
+
+    def test_duplicate_differing_only_in_case(self):
+        first = self.post({"company": "Acme", "email": "ops@acme.io"})
+        second = self.post({"company": "Acme", "email": "OPS@acme.io"})
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()["id"], first.json()["id"])
+        self.assertEqual(WebsiteLead.objects.count(), 1)
+
+    def test_rejects_bad_bodies(self):
+        cases = [
+            (b"{not json", "Invalid JSON"),
+            ([{"company": "Acme", "email": "ops@acme.io"}], "Expected a JSON object"),
+            ({"email": "ops@acme.io"}, "Company name is required"),
+            ({"company": "Acme"}, "Email is required"),
+            ({"company": "Acme", "email": "not-an-email"}, "Invalid email"),
+        ]
+        for payload, error in cases:
+            with self.subTest(payload=payload):
+                response = self.post(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"error": error})
+        self.assertFalse(WebsiteLead.objects.exists())
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+class ParseScoreTests(TestCase):
+    def test_plain_json(self):
+        self.assertEqual(
+            score_leads.parse_score('{"icp": true, "reason": "Founder of 5-person SEO agency"}'),
+            {"icp": True, "reason": "Founder of 5-person SEO agency"},
+        )
+
+    def test_code_fence_is_stripped(self):
+        self.assertEqual(
+            score_leads.parse_score('```json\n{"icp": false, "reason": "Enterprise"}\n```'),
+            {"icp": False, "reason": "Enterprise"},
+        )
+
+    def test_object_embedded_in_text(self):
+        self.assertEqual(
+            score_leads.parse_score('Here you go: {"icp": false, "reason": "Hobbyist"} thanks'),
+            {"icp": False, "reason": "Hobbyist"},
+        )
+
+    def test_list_takes_first_object(self):
+        self.assertEqual(score_leads.parse_score('[{"icp": true, "reason": "Owner"}]'), {"icp": True, "reason": "Owner"})
+
+    def test_unparseable_is_none(self):
+        self.assertIsNone(score_leads.parse_score("no json here"))
+        self.assertIsNone(score_leads.parse_score("[]"))
+
+
+def batch_output_line(custom_id, content=None, status_code=200):
+    """One line of a Batch API output file, as OpenAI writes it"""
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}]} if status_code == 200 else {}
+    return json.dumps({
+        "id": f"batch_req_{custom_id}",
+        "custom_id": str(custom_id),
+        "response": {"status_code": status_code, "request_id": f"req_{custom_id}", "body": body},
+        "error": None,
+    })
+
+
+class CollectBatchTests(TestCase):
+    def setUp(self):
+        self.icp, self.rejected, self.failed = (
+            Lead.objects.create(email=f"lead{i}@example.com", processing=True, scoring_batch_id="batch_1")
+            for i in range(3)
+        )
+        self.output = "\n".join([
+            batch_output_line(self.icp.id, '{"icp": true, "reason": "Owner of 4-person agency"}'),
+            batch_output_line(self.rejected.id, '{"icp": false, "reason": "VC-funded SaaS"}'),
+            batch_output_line(self.failed.id, status_code=500),
+            "",
+        ])
+
+    def collect(self, status="completed"):
+        client = mock.Mock()
+        client.batches.retrieve.return_value = SimpleNamespace(status=status, output_file_id="file_1")
+        client.files.content.return_value = SimpleNamespace(text=self.output)
+        with mock.patch.object(score_leads, "client", client):
+            score_leads.collect_batch("batch_1", poll_sec=0)
+
+    def test_writes_scores_and_releases_unscored_leads(self):
+        self.collect()
+
+        for lead in (self.icp, self.rejected, self.failed):
+            lead.refresh_from_db()
+            self.assertFalse(lead.processing)
+            self.assertIsNone(lead.scoring_batch_id)
+
+        self.assertTrue(self.icp.score)
+        self.assertEqual(self.icp.score_reason, "Owner of 4-person agency")
+        self.assertFalse(self.rejected.score)
+        self.assertEqual(self.rejected.score_reason, "VC-funded SaaS")
+        # Failed requests go back into the queue unjudged
+        self.assertIsNone(self.failed.score_reason)
+
+    def test_failed_batch_releases_every_lead(self):
+        self.collect(status="failed")
+
+        self.assertFalse(Lead.objects.filter(scoring_batch_id="batch_1").exists())
+        self.assertFalse(Lead.objects.filter(processing=True).exists())
+        self.assertFalse(Lead.objects.filter(score_reason__isnull=False).exists())
+
+
+class SendOutreachTests(TestCase):
+    def setUp(self):
+        self.lead = Lead.objects.create(email="ann@acme.io", ready_to_send=True)
+        self.copy = LeadEmailCopy.objects.create(
+            lead=self.lead, template_name="intro", subject="Hi", body="...", ready_to_send=True
+        )
+        self.sender = send_outreach.smtp_client.accounts[0]["EMAIL_HOST_USER"]
+
+    def send(self, success=True):
+        with mock.patch.object(
+            send_outreach.smtp_client, "send_email", return_value=(self.sender, success)
+        ) as send_email:
+            result = send_outreach.send_one_email(self.copy.id, self.sender)
+        self.copy.refresh_from_db()
+        self.lead.refresh_from_db()
+        return result, send_email
+
+    def queue_batch(self):
+        with mock.patch.object(send_outreach.send_one_email, "apply_async") as apply_async:
+            send_outreach.send_rotating_outreach_batch()
+        return [call.kwargs["args"][0] for call in apply_async.call_args_list]
+
+    def test_success_sets_sent_with_sent_at(self):
+        result, _ = self.send()
+
+        self.assertEqual(result, "Sent")
+        self.assertTrue(self.copy.sent)
+        self.assertIsNotNone(self.copy.sent_at)
+        self.assertTrue(self.lead.email_sent)
+
+    def test_failure_releases_the_claim(self):
+        result, _ = self.send(success=False)
+
+        self.assertEqual(result, "Failed")
+        self.assertFalse(self.copy.sent)
+        self.assertIsNone(self.copy.claimed_at)
+        self.assertEqual(self.queue_batch(), [self.copy.id])
+
+    def test_in_flight_claim_blocks_duplicates_and_requeues(self):
+        LeadEmailCopy.objects.filter(pk=self.copy.pk).update(claimed_at=timezone.now())
+
+        result, send_email = self.send()
+
+        self.assertEqual(result, "Already claimed")
+        send_email.assert_not_called()
+        self.assertEqual(self.queue_batch(), [])
+
+    def test_stale_claim_from_a_dead_worker_is_retried(self):
+        stale = timezone.now() - send_outreach.CLAIM_TIMEOUT - timedelta(minutes=1)
+        LeadEmailCopy.objects.filter(pk=self.copy.pk).update(claimed_at=stale)
+
+        self.assertEqual(self.queue_batch(), [self.copy.id])
+        result, _ = self.send()
+
+        self.assertEqual(result, "Sent")
+        self.assertTrue(self.copy.sent)
@@ -1,120 +1,192 @@
-from django.shortcuts import render
-
-# Create your views here.
-from django.http import HttpResponse
-from django.http import HttpResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.utils import timezone
-from outbound.models import *
-import logging
+import asyncio
 import json
-from datetime import datetime
-
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+import logging
+import re
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
-
+from outbound.engine.utils import PENDING_OPENS_KEY, open_buffer_aredis
+from outbound.models import LeadEmailCopy, WebsiteLead
 
 
 logger = logging.getLogger(__name__)
 
+# Transparent 1x1 GIF served by the tracking pixel
+_TRACKING_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00'
+    b'\xff\xff\xff\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00'
+    b'\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02'
+    b'\x44\x01\x00\x3b'
+)
+# Bump the version if the GIF bytes ever change
+_PIXEL_ETAG = '"pixel-v1"'
+# Built once; every pixel response reuses the same header values.
+# no-cache (not no-store): clients may keep the GIF but must revalidate, so every open still reaches us
+_PIXEL_RESPONSE_HEADERS = {
+    "Content-Type": "image/gif",
+    "Content-Length": str(len(_TRACKING_GIF)),
+    "Cache-Control": "private, no-cache",
+    "ETag": _PIXEL_ETAG,
+}
+
+# Cheap shape check for lead-form emails, rejected before touching the DB
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+\Z")
+
+
+# (monotonic stamp, aware datetime), refreshed at most once a second
+_coarse_now_cache = [float("-inf"), None]
+
+
+def _coarse_now():
+    """timezone.now() to the second; open timestamps don't need finer resolution"""
+    tick = time.monotonic()
+    if tick - _coarse_now_cache[0] >= 1:
+        _coarse_now_cache[:] = [tick, timezone.now()]
+    return _coarse_now_cache[1]
+
 
 def home(request):
     return HttpResponse("Genesis Engine running 🚀")
 
 
 @csrf_exempt
-def track_email_open(request, lead_id):
+async def track_email_open(request, lead_id):
     """
     Tracking pixel endpoint - records when lead opens email.
     Returns a transparent 1x1 GIF.
     """
-    try:
-        # Find the lead by lead_id
-        lead = VerifiedLead.objects.get(lead_id=lead_id)
+    # Record the open in the background so the GIF ships without waiting on Redis/DB.
+    # Revalidations count too: the pixel URL is per lead, not per copy, so a cached GIF
+    # can be a later copy's first open. opened=False keeps repeats idempotent.
+    task = asyncio.create_task(_record_open(lead_id))
+    _open_tasks.add(task)
+    task.add_done_callback(_open_tasks.discard)
+
+    # The client already holds the GIF; confirm it without resending the body
+    if request.headers.get("If-None-Match") == _PIXEL_ETAG:
+        return HttpResponseNotModified(headers={"ETag": _PIXEL_ETAG})
+
+    # Return a transparent 1x1 pixel GIF (even if tracking fails)
+    # This prevents broken image icons in emails
+    return _pixel_response()
 
-        # Only update if not already marked as opened (track first open only)
-        if not lead.opened:
-            lead.opened = True
-            lead.opened_date = timezone.now()
-            lead.save()
 
-            logger.info(f"✓ Email opened by {lead.email} ({lead.name})")
+# Strong refs to in-flight _record_open tasks; the loop only keeps weak ones
+_open_tasks = set()
 
-    except VerifiedLead.DoesNotExist:
-        logger.warning(f"Tracking attempt for non-existent lead_id: {lead_id}")
+
+async def _record_open(lead_id):
+    """Buffer or write one open; errors are logged here since nobody awaits the task"""
+    try:
+        # With Redis, just buffer the id (a set, so repeats collapse); flush_pixel_opens writes it
+        buffer = open_buffer_aredis()
+        if buffer is not None:
+            await buffer.sadd(PENDING_OPENS_KEY, int(lead_id))
+            return
+
+        # Single conditional UPDATE: the first open flips the flag, repeat opens match no rows.
+        # The open flag lives on LeadEmailCopy; lead_id is the Lead's primary key.
+        updated = await LeadEmailCopy.objects.filter(
+            lead_id=int(lead_id), sent=True, opened=False
+        ).aupdate(opened=True, updated_at=_coarse_now())
+
+        if updated:
+            logger.info("✓ Email opened by lead %s", lead_id)
+        elif logger.isEnabledFor(logging.DEBUG) and not await LeadEmailCopy.objects.filter(lead_id=int(lead_id)).aexists():
+            logger.debug("Tracking attempt for non-existent lead_id: %s", lead_id)
+
+    except ValueError:
+        logger.warning("Tracking attempt for non-existent lead_id: %s", lead_id)
     except Exception as e:
-        logger.error(f"Tracking error for lead_id {lead_id}: {str(e)}")
+        logger.error("Tracking error for lead_id %s: %s", lead_id, e)
 
-    # Return a transparent 1x1 pixel GIF (even if tracking fails)
-    # This prevents broken image icons in emails
-    transparent_gif = (
-        b'\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00'
-        b'\xff\xff\xff\x00\x00\x00\x21\xf9\x04\x01\x00\x00\x00'
-        b'\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02'
-        b'\x44\x01\x00\x3b'
-    )
 
-    return HttpResponse(transparent_gif, content_type='image/gif')
+def _pixel_response():
+    return HttpResponse(_TRACKING_GIF, headers=_PIXEL_RESPONSE_HEADERS)
 
 
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def create_lead(request):
-    print("🔵 /api/lead hit")
-    print("Method:", request.method)
-    print("Headers:", dict(request.headers))
-    print("Raw body bytes:", request.body)
+def post_only_no_csrf(view):
+    """csrf_exempt + require_http_methods(["POST"]) folded into one async wrapper"""
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        return await view(request, *args, **kwargs)
+
+    wrapped.csrf_exempt = True
+    return wrapped
+
+
+@sync_to_async
+def _insert_website_lead(email, company, description):
+    """
+    One INSERT, no lookup first; uniq_websitelead_email rejects a resubmitted email.
+    The savepoint keeps that IntegrityError from breaking an enclosing transaction.
+    Returns (id, created).
+    """
+    try:
+        with transaction.atomic():
+            lead = WebsiteLead.objects.create(
+                email=email, company_name=company, description=description
+            )
+        return lead.id, True
+    except IntegrityError:
+        return WebsiteLead.objects.filter(email=email).values_list("id", flat=True).first(), False
+
 
+@post_only_no_csrf
+async def create_lead(request):
     try:
-        # Parse JSON
-        data = json.loads(request.body.decode("utf-8"))
-        print("Parsed JSON:", data)
-
-        company = data.get("company", "").strip()
-        email = data.get("email", "").strip()
-        description = data.get("description", "").strip()
-        offer_expires = data.get("offer_expires")
-        print("company:", company)
-        print("email:", email)
-        print("description:", description)
-        print("offer_expires:", offer_expires)
+        # json.loads takes the raw bytes (UTF-8/16/32 detected), no decoded str copy
+        try:
+            data = json.loads(request.body)
+        except ValueError:  # JSONDecodeError and UnicodeDecodeError
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({"error": "Expected a JSON object"}, status=400)
+        logger.debug("create_lead payload: %s", data)
+
+        # `or ""` also covers explicit nulls, which .get(key, "") lets through
+        company = str(data.get("company") or "").strip()
+        # Stored lower-cased; uniq_websitelead_email compares Lower("email")
+        email = str(data.get("email") or "").strip().lower()
+        description = str(data.get("description") or "").strip()
 
         if not company:
             return JsonResponse({"error": "Company name is required"}, status=400)
         if not email:
             return JsonResponse({"error": "Email is required"}, status=400)
+        if not EMAIL_RE.match(email):
+            return JsonResponse({"error": "Invalid email"}, status=400)
 
-        offer_expires_date = None
-        print("✅ Creating Lead in DB...")
-        lead = WebsiteLead.objects.create(
-            company_name=company,
-            email=email,
-            description=description,
-        )
-        print("✅ Lead created with ID:", lead.id)
+        lead_id, created = await _insert_website_lead(email, company, description)
+        if not created:
+            logger.debug("WebsiteLead already exists with ID: %s", lead_id)
+            return JsonResponse({"message": "Lead already exists", "id": lead_id}, status=200)
+
+        logger.debug("WebsiteLead created with ID: %s", lead_id)
 
         return JsonResponse(
             {
                 "message": "Lead created",
-                "id": lead.id,
+                "id": lead_id,
             },
             status=201,
         )
 
     except Exception as e:
-        import traceback
-        print("🔥 EXCEPTION in create_lead:", e)
-        traceback.print_exc()
+        logger.exception("create_lead failed")
 
-        # Return full details in dev so your frontend .text() shows it
-        return JsonResponse(
-            {
-                "error": "Server error",
-                "detail": str(e),
-                "traceback": traceback.format_exc(),
-            },
-            status=500,
-        )
+        # Error details only in dev, so the frontend's .text() shows them there
+        body = {"error": "Server error"}
+        if settings.DEBUG:
+            body["detail"] = str(e)
+        return JsonResponse(body, status=500)